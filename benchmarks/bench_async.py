@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import setup_bench
+
+
+async def timed(call):
+    started = time.perf_counter()
+    await call()
+    return time.perf_counter() - started
+
+
+async def run_tasks(label, make_call, tasks):
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed(make_call(i)) for i in range(tasks)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label}: {tasks / elapsed:,.0f} queries/sec, "
+        f"p50 {p50:.2f} ms, p99 {p99:.2f} ms"
+    )
+
+
+async def main(rows, tasks):
+    lq = setup_bench(rows, use_async=True)
+    await lq.connect()
+    sync_lq = lq._lq
+
+    for _ in range(2):
+        await run_tasks(
+            "asyncio.to_thread",
+            lambda i: lambda: asyncio.to_thread(sync_lq.get_user_by_id, id=i % rows),
+            tasks,
+        )
+        await run_tasks(
+            "workers",
+            lambda i: lambda: lq.get_user_by_id(id=i % rows),
+            tasks,
+        )
+    await lq.disconnect()
+    sync_lq.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.tasks))
@@ -0,0 +1,67 @@
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.common import setup_bench
+
+
+def query_latencies(lq, rows: int, done: threading.Event) -> list[float]:
+    latencies = []
+    i = 0
+    while not done.is_set():
+        started = time.perf_counter()
+        lq.update_user_email(id=i % rows + 1, email=f"new{i}@example.com")
+        lq.get_user_by_id(id=(i * 7) % rows + 1)
+        latencies.append(time.perf_counter() - started)
+        i += 1
+    return latencies
+
+
+def report(label: str, latencies: list[float]):
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label}: {len(latencies):,} round trips, "
+        f"p50 {quantiles[49] * 1e6:,.0f} us, p99 {quantiles[98] * 1e6:,.0f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--pages-per-step", type=int, default=1024)
+    args = parser.parse_args()
+
+    lq = setup_bench(args.rows)
+    directory = Path(tempfile.mkdtemp(prefix="litequery-backup-"))
+
+    done = threading.Event()
+    timer = threading.Timer(1.0, done.set)
+    timer.start()
+    report("no backup", query_latencies(lq, args.rows, done))
+
+    for label, options in (
+        (f"backup, {args.pages_per_step} pages/step", {"sleep": 0.001}),
+        ("backup, single step", {"pages_per_step": -1}),
+        ("backup, vacuum into", {"vacuum": True}),
+    ):
+        options.setdefault("pages_per_step", args.pages_per_step)
+        done = threading.Event()
+
+        def run_backup(options=options, done=done):
+            started = time.perf_counter()
+            lq.backup(directory / "backup.db", **options)
+            print(f"{label} took {time.perf_counter() - started:.2f}s")
+            done.set()
+
+        thread = threading.Thread(target=run_backup)
+        thread.start()
+        report(label, query_latencies(lq, args.rows, done))
+        thread.join()
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import os
+import tracemalloc
+
+from benchmarks.common import best_of, setup_bench
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    lq = setup_bench(0)
+    lq.raw("create table files (id integer primary key, data blob)")
+    lq.raw("insert into files (id) values (1)")
+    with open(os.devnull, "wb") as out:
+
+        def write():
+            with open("/dev/urandom", "rb") as source:
+                lq.write_blob("files", "data", 1, source, args.size, args.chunk_size)
+
+        def select():
+            out.write(lq.raw_value("select data from files where id = 1"))
+
+        def stream():
+            lq.read_blob("files", "data", 1, out, args.chunk_size)
+
+        mb = args.size / 1024 / 1024
+        print(f"write_blob: {mb / best_of(write, 1):,.0f} MB/sec")
+        for name, fn in (("select", select), ("read_blob", stream)):
+            elapsed = best_of(fn, 3)
+            peak = peak_memory(fn) / 1024 / 1024
+            print(f"{name}: {mb / elapsed:,.0f} MB/sec, peak {peak:,.1f} MB")
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
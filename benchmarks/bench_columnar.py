@@ -0,0 +1,50 @@
+import argparse
+import tracemalloc
+
+from benchmarks.common import best_of, setup_bench
+
+AGGREGATE_SQL = """
+select id % 1000 as bucket, id * 2 as total, id / 3.0 as average
+from numbers
+"""
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lq = setup_bench(0)
+    with lq.transaction():
+        lq.raw("create table numbers (id integer primary key)")
+        lq.raw(
+            "with recursive s(n) as (select 1 union all select n + 1 from s "
+            "where n < :n) insert into numbers (id) select n from s",
+            n=args.rows,
+        )
+
+    def rows_to_columns():
+        rows = lq.raw(AGGREGATE_SQL)
+        return {name: [row[name] for row in rows] for name in rows[0].to_dict()}
+
+    def columnar():
+        return lq.raw_columnar(AGGREGATE_SQL)
+
+    for label, fn in (("Rows -> columns", rows_to_columns), ("columnar", columnar)):
+        elapsed = best_of(fn, args.repeat)
+        peak = peak_memory(fn) / 2**20
+        print(f"{label}: {args.rows / elapsed:,.0f} rows/sec, peak {peak:,.0f} MiB")
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+
+from benchmarks.common import best_of, setup_bench
+from litequery.core import DeferredQuery
+
+QUERIES = [
+    "select count(*) from users where name like :pattern",
+    "select max(length(email)) from users where email like :pattern",
+    "select count(distinct substr(name, 1, 6)) from users where name like :pattern",
+    "select sum(id % 7) from users where email like :pattern",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=0)
+    args = parser.parse_args()
+
+    lq = setup_bench(args.rows, pool_size=args.pool_size or None)
+    sqls = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+
+    def sequential():
+        for sql in sqls:
+            lq.raw_value(sql, pattern="%1%")
+
+    def gathered():
+        parameters = [{"sql": sql, "pattern": "%1%"} for sql in sqls]
+        lq.gather(*(DeferredQuery(lq.raw_value, p) for p in parameters))
+
+    elapsed = best_of(sequential, 3)
+    print(f"sequential: {elapsed * 1000:.1f} ms")
+    elapsed = best_of(gathered, 3)
+    print(f"gather: {elapsed * 1000:.1f} ms")
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
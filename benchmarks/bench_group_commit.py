@@ -0,0 +1,42 @@
+import argparse
+import threading
+import time
+
+from benchmarks.common import setup_bench
+
+
+def run_writers(lq, threads: int, writes: int) -> float:
+    def write():
+        for i in range(writes):
+            lq.insert_user(name=f"user{i}", email=f"user{i}@example.com")
+
+    workers = [threading.Thread(target=write) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+    total = args.threads * args.writes
+
+    for label, options in [
+        ("autocommit", {}),
+        ("autocommit + pool", {"pool_size": 4}),
+        ("group commit", {"group_commit": True}),
+        ("group commit, 2 ms", {"group_commit": True, "group_commit_delay": 0.002}),
+    ]:
+        lq = setup_bench(0, **options)
+        elapsed = run_writers(lq, args.threads, args.writes)
+        print(f"{label}: {total / elapsed:,.0f} inserts/sec")
+        lq.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import argparse
+
+from benchmarks.common import best_of, setup_bench
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    lq = setup_bench(0)
+    rows = [
+        {"name": f"user{i}", "email": f"user{i}@example.com"} for i in range(args.rows)
+    ]
+    updates = [{"id": i + 1, "email": f"new{i}@example.com"} for i in range(args.rows)]
+
+    elapsed = best_of(lambda: [lq.insert_user(**row) for row in rows], 1)
+    print(f"insert_user per call: {args.rows / elapsed:,.0f} rows/sec")
+    elapsed = best_of(lambda: lq.insert_user.many(rows), 1)
+    print(f"insert_user.many: {args.rows / elapsed:,.0f} rows/sec")
+    elapsed = best_of(lambda: lq.update_user_email.many(updates), 1)
+    print(f"update_user_email.many: {args.rows / elapsed:,.0f} rows/sec")
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+
+from benchmarks.common import best_of, setup_bench
+
+OFFSET_SQL = "select * from users order by id limit :limit offset :offset"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    lq = setup_bench(args.rows)
+
+    def offset_scan():
+        offset = 0
+        while page := lq.raw(OFFSET_SQL, limit=args.page_size, offset=offset):
+            offset += len(page)
+
+    def keyset_scan():
+        for _ in lq.get_all_users.paginate(order_by="id", page_size=args.page_size):
+            pass
+
+    elapsed = best_of(offset_scan, 1)
+    print(f"limit/offset: {args.rows / elapsed:,.0f} rows/sec")
+    elapsed = best_of(keyset_scan, 1)
+    print(f"paginate: {args.rows / elapsed:,.0f} rows/sec")
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+
+from benchmarks.common import best_of, setup_bench
+
+
+@dataclass(slots=True)
+class User:
+    id: int
+    name: str
+    email: str
+    created_at: datetime
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lq = setup_bench(args.rows)
+    elapsed = best_of(lq.get_all_users, args.repeat)
+    print(f"get_all_users: {args.rows / elapsed:,.0f} rows/sec")
+
+    # Typed columns are converted on first access, so this pays for them too.
+    elapsed = best_of(lambda: [u.created_at for u in lq.get_all_users()], args.repeat)
+    print(f"get_all_users + created_at: {args.rows / elapsed:,.0f} rows/sec")
+
+    users = lq.get_all_users()
+    elapsed = best_of(lambda: [(u.id, u["name"], u.email) for u in users], args.repeat)
+    print(f"column access: {args.rows * 3 / elapsed:,.0f} lookups/sec")
+
+    elapsed = best_of(lambda: users.into(User), args.repeat)
+    print(f"Rows.into: {args.rows / elapsed:,.0f} rows/sec")
+    elapsed = best_of(lambda: lq.get_all_users.into(User), args.repeat)
+    print(f"get_all_users.into: {args.rows / elapsed:,.0f} rows/sec")
+    lq.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import litequery
+
+QUERY = """
+-- name: get_{name}^
+select
+  *
+from
+  users
+where
+  id = :id
+  and email = :email;
+"""
+
+
+def make_catalog(directory: Path, files: int, queries: int):
+    for i in range(files):
+        content = "".join(QUERY.format(name=f"{i}_{j}") for j in range(queries))
+        (directory / f"queries_{i}.sql").write_text(content)
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="litequery-bench-"))
+    queries_path = directory / "queries"
+    queries_path.mkdir()
+    make_catalog(queries_path, args.files, args.queries)
+    db_path = directory / "bench.db"
+
+    def start():
+        litequery.setup(db_path, queries_path).close()
+
+    cold = timed(start)
+    warm = min(timed(start) for _ in range(5))
+    shutil.rmtree(queries_path / "__pycache__")
+    parse_only = timed(lambda: litequery.core.parse_queries(queries_path))
+
+    total = args.files * args.queries
+    print(f"{total} queries in {args.files} files")
+    print(f"parse_queries: {parse_only * 1000:.1f} ms")
+    print(f"setup, cold catalog: {cold * 1000:.1f} ms")
+    print(f"setup, cached catalog: {warm * 1000:.1f} ms")
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
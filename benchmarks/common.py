@@ -0,0 +1,71 @@
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import litequery
+
+USERS_SQL = """
+-- name: get_all_users
+select
+  *
+from
+  users;
+
+-- name: get_user_by_id^
+select
+  *
+from
+  users
+where
+  id = :id;
+
+-- name: insert_user<!
+insert into
+  users (name, email)
+values
+  (:name, :email);
+
+-- name: update_user_email!
+update users
+set
+  email = :email
+where
+  id = :id;
+"""
+
+
+def make_users_db(directory: Path, rows: int) -> Path:
+    db_path = directory / "bench.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            create table users (
+                id integer primary key autoincrement,
+                name text not null,
+                email text not null,
+                created_at datetime not null default current_timestamp
+            );
+        """)
+        conn.executemany(
+            "insert into users (name, email) values (?, ?)",
+            ((f"user{i}", f"user{i}@example.com") for i in range(rows)),
+        )
+    queries_path = directory / "queries"
+    queries_path.mkdir(exist_ok=True)
+    (queries_path / "users.sql").write_text(USERS_SQL)
+    return db_path
+
+
+def setup_bench(rows: int, **options):
+    directory = Path(tempfile.mkdtemp(prefix="litequery-bench-"))
+    db_path = make_users_db(directory, rows)
+    return litequery.setup(db_path, directory / "queries", **options)
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
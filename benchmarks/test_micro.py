@@ -0,0 +1,18 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from litequery.bench import compare, format_regression, load_baseline, run_micro
+
+BASELINE = Path(
+    os.getenv("LITEQUERY_BENCH_BASELINE", Path(__file__).with_name("baseline.json"))
+)
+THRESHOLD = float(os.getenv("LITEQUERY_BENCH_THRESHOLD", "0.15"))
+
+
+def test_micro_benchmarks():
+    if not BASELINE.exists():
+        pytest.skip(f"No baseline, save one with: lq bench --micro --save {BASELINE}")
+    regressions = compare(run_micro(), load_baseline(BASELINE), THRESHOLD)
+    assert not regressions, "\n".join(map(format_regression, regressions))
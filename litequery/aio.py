@@ -0,0 +1,337 @@
+import asyncio
+import itertools
+import queue
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from itertools import islice
+
+from litequery.blobs import CHUNK_SIZE
+from litequery.cache import written_tables
+from litequery.core import WRITE_OPS, DeferredQueries, DeferredQuery, Litequery
+
+
+class _Worker(threading.Thread):
+    """Thread that owns one SQLite connection and runs jobs in batches.
+
+    Jobs queued while the worker is busy are drained together and their
+    futures are settled with a single hop back to the event loop.
+    """
+
+    def __init__(self, lq: Litequery, name: str, batch_size: int):
+        super().__init__(name=name, daemon=True)
+        self._lq = lq
+        self._batch_size = batch_size
+        self.jobs: queue.SimpleQueue = queue.SimpleQueue()
+
+    def submit(self, fn, *args) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.jobs.put((future, fn, args))
+        return future
+
+    def stop(self):
+        self.jobs.put(None)
+
+    def run(self):
+        running = True
+        while running:
+            batch = [self.jobs.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+
+            settled = defaultdict(list)
+            for job in batch:
+                if job is None:
+                    running = False
+                    continue
+                future, fn, args = job
+                try:
+                    outcome = (future, fn(*args), None)
+                except BaseException as e:
+                    outcome = (future, None, e)
+                settled[future.get_loop()].append(outcome)
+
+            for loop, outcomes in settled.items():
+                try:
+                    loop.call_soon_threadsafe(_settle, outcomes)
+                except RuntimeError:
+                    pass  # The loop was closed while the batch was running.
+
+        self._lq._close_thread_connection()
+
+
+def _settle(outcomes):
+    for future, result, error in outcomes:
+        if future.cancelled():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+def _take(rows, count: int) -> list:
+    return list(islice(rows, count))
+
+
+class AsyncQueryMethod:
+    __slots__ = ("_alq", "_method")
+
+    def __init__(self, alq: "AsyncLitequery", method):
+        self._alq = alq
+        self._method = method
+
+    async def __call__(self, **parameters):
+        lq, query = self._method._lq, self._method.query
+        batcher = getattr(lq, "_batcher", None)
+        if batcher is not None and lq.instrumentation is None:
+            # Group commit already runs on its own thread, so queue the write
+            # there directly instead of parking a worker on its future.
+            if query.op in WRITE_OPS and self._alq._tx.get() is None:
+                future = lq._submit_write(batcher, query, parameters)
+                try:
+                    return await asyncio.wrap_future(future)
+                finally:
+                    # Same as _run_cached, there's no transaction to defer to.
+                    if lq.cache is not None:
+                        lq.cache.invalidate(written_tables(query.sql))
+        return await self._alq._submit(self._method, **parameters)
+
+    def into(self, cls, /, **parameters):
+        return self._alq._submit(self._method.into, cls, **parameters)
+
+    def many(self, parameters, chunk_size: int = 10_000):
+        return self._alq._submit(self._method.many, parameters, chunk_size)
+
+    def iter(self, batch_size: int = 1000, **parameters) -> AsyncIterator:
+        return self._alq._iter(self._method.iter, batch_size, **parameters)
+
+    async def paginate(self, order_by, page_size: int = 1000, **parameters):
+        # Pages are separate queries, so any worker can fetch the next one.
+        pages = self._method.paginate(order_by, page_size, **parameters)
+        while (page := await self._alq._submit(next, pages, None)) is not None:
+            yield page
+
+    def columnar(self, batch_size: int = 10_000, **parameters):
+        return self._alq._submit(self._method.columnar, batch_size, **parameters)
+
+
+class AsyncLitequery:
+    def __init__(self, lq: Litequery, workers: int = 4, batch_size: int = 64):
+        self._lq = lq
+        self._worker_count = workers
+        self._batch_size = batch_size
+        self._workers: list[_Worker] = []
+        self._tx_worker: _Worker | None = None
+        self._tx_lock = asyncio.Lock()
+        self._tx: ContextVar[_Worker | None] = ContextVar(
+            f"litequery_tx_{id(self)}", default=None
+        )
+        self._next_worker: Iterator[_Worker] = iter(())
+
+    @property
+    def config(self):
+        return self._lq.config
+
+    def __getattr__(self, name: str):
+        if name not in self._lq.__dict__.get("_queries", {}):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        method = AsyncQueryMethod(self, getattr(self._lq, name))
+        setattr(self, name, method)
+        return method
+
+    async def connect(self):
+        if self._workers:
+            return
+        self._workers = [
+            _Worker(self._lq, f"litequery-{i}", self._batch_size)
+            for i in range(self._worker_count)
+        ]
+        self._tx_worker = _Worker(self._lq, "litequery-tx", self._batch_size)
+        self._tx_lock = asyncio.Lock()
+        self._next_worker = itertools.cycle(self._workers)
+        for worker in (*self._workers, self._tx_worker):
+            worker.start()
+        # The first connection may switch the database to WAL, which needs an
+        # exclusive lock, so it is opened before the others.
+        first, *rest = self._workers
+        try:
+            await first.submit(self._lq.connect)
+            await asyncio.gather(*(w.submit(self._lq.connect) for w in rest))
+        except BaseException:
+            await self.disconnect()
+            raise
+
+    async def disconnect(self):
+        workers = [*self._workers, self._tx_worker] if self._workers else []
+        self._workers = []
+        self._tx_worker = None
+        for worker in workers:
+            worker.stop()
+        for worker in workers:
+            await asyncio.to_thread(worker.join)
+        await asyncio.to_thread(self._lq.close)
+
+    close = disconnect
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.disconnect()
+
+    def _pick_worker(self) -> _Worker:
+        worker = self._tx.get()
+        if worker is not None:
+            return worker
+        return next(self._next_worker)
+
+    async def _submit(self, fn, *args, **parameters):
+        if not self._workers:
+            await self.connect()
+        if parameters:
+            return await self._pick_worker().submit(lambda: fn(*args, **parameters))
+        return await self._pick_worker().submit(fn, *args)
+
+    @property
+    def q(self) -> DeferredQueries:
+        return DeferredQueries(self._lq)
+
+    async def gather(self, *queries: DeferredQuery, return_exceptions: bool = False):
+        # Workers are picked in turn, so the queries run on separate connections.
+        return await asyncio.gather(
+            *(self._submit(query) for query in queries),
+            return_exceptions=return_exceptions,
+        )
+
+    async def raw(self, sql: str, **parameters):
+        return await self._submit(self._lq.raw, sql, **parameters)
+
+    async def raw_one(self, sql: str, **parameters):
+        return await self._submit(self._lq.raw_one, sql, **parameters)
+
+    async def raw_value(self, sql: str, **parameters):
+        return await self._submit(self._lq.raw_value, sql, **parameters)
+
+    async def raw_columnar(self, sql: str, batch_size: int = 10_000, **parameters):
+        fn = self._lq.raw_columnar
+        return await self._submit(fn, sql, batch_size, **parameters)
+
+    def raw_iter(self, sql: str, batch_size: int = 1000, **parameters):
+        return self._iter(self._lq.raw_iter, batch_size, sql, **parameters)
+
+    async def read_blob(self, table, column, row, out, chunk_size=CHUNK_SIZE):
+        fn = self._lq.read_blob
+        return await self._submit(fn, table, column, row, out, chunk_size)
+
+    async def read_blob_into(self, table, column, row, buffer, offset: int = 0):
+        fn = self._lq.read_blob_into
+        return await self._submit(fn, table, column, row, buffer, offset)
+
+    async def write_blob(
+        self, table, column, row, source, size=None, chunk_size=CHUNK_SIZE
+    ):
+        fn = self._lq.write_blob
+        return await self._submit(fn, table, column, row, source, size, chunk_size)
+
+    async def iter_blob(self, table, column, row, chunk_size: int = CHUNK_SIZE):
+        if not self._workers:
+            await self.connect()
+
+        # The blob handle belongs to one connection, so every chunk is read on
+        # the worker that opened it.
+        worker = self._pick_worker()
+        chunks = self._lq.iter_blob(table, column, row, chunk_size)
+        try:
+            while (chunk := await worker.submit(next, chunks, None)) is not None:
+                yield chunk
+        finally:
+            await worker.submit(chunks.close)
+
+    async def _iter(self, fn, batch_size: int, *args, **parameters):
+        if not self._workers:
+            await self.connect()
+
+        # Cursors can't leave the thread that created them, so every batch
+        # of this iterator is fetched on the same worker.
+        worker = self._pick_worker()
+        rows = await worker.submit(
+            lambda: fn(*args, batch_size=batch_size, **parameters)
+        )
+        try:
+            while batch := await worker.submit(_take, rows, batch_size):
+                for row in batch:
+                    yield row
+        finally:
+            await worker.submit(rows.close)
+
+    @asynccontextmanager
+    async def transaction(self, mode: str = "immediate"):
+        if not self._workers:
+            await self.connect()
+
+        worker = self._tx.get()
+        if worker is not None:
+            cm = self._lq.transaction(mode)
+            await worker.submit(cm.__enter__)
+            async with self._exit_on(worker, cm):
+                yield
+            return
+
+        async with self._tx_lock:
+            worker = self._tx_worker
+            if worker is None:
+                raise RuntimeError("The database was disconnected.")
+            cm = self._lq.transaction(mode)
+            await worker.submit(cm.__enter__)
+            token = self._tx.set(worker)
+            try:
+                async with self._exit_on(worker, cm):
+                    yield
+            finally:
+                self._tx.reset(token)
+
+    @asynccontextmanager
+    async def read_snapshot(self):
+        if not self._workers:
+            await self.connect()
+
+        worker = self._tx.get()
+        if worker is not None:
+            yield
+            return
+
+        # Snapshots don't block each other or writers, so each one gets its
+        # own short-lived worker instead of queueing on the transaction one.
+        worker = _Worker(self._lq, "litequery-snapshot", self._batch_size)
+        worker.start()
+        try:
+            cm = self._lq.read_snapshot()
+            await worker.submit(cm.__enter__)
+            token = self._tx.set(worker)
+            try:
+                async with self._exit_on(worker, cm):
+                    yield
+            finally:
+                self._tx.reset(token)
+        finally:
+            worker.stop()
+            await asyncio.to_thread(worker.join)
+
+    @asynccontextmanager
+    async def _exit_on(self, worker: _Worker, cm):
+        try:
+            yield
+        except BaseException as e:
+            await worker.submit(cm.__exit__, type(e), e, e.__traceback__)
+            raise
+        else:
+            await worker.submit(cm.__exit__, None, None, None)
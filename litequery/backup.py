@@ -0,0 +1,58 @@
+import os
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+
+Progress = Callable[[int, int, int], object]
+
+
+def backup(
+    source: sqlite3.Connection,
+    target: str | Path,
+    pages_per_step: int = 1024,
+    sleep: float = 0.0,
+    progress: Progress | None = None,
+    vacuum: bool = False,
+) -> Path:
+    """Copy the database behind `source` into `target` while it stays online.
+
+    The copy is written next to `target` and renamed into place once complete,
+    so `target` is never left half-written. With `vacuum`, `VACUUM INTO` writes
+    a compacted copy instead of copying pages as they are. `progress` is called
+    with (status, remaining, total) pages after every step.
+    """
+    target = Path(target).resolve()
+    partial = target.with_name(f"{target.name}.partial")
+    partial.unlink(missing_ok=True)
+
+    # In WAL mode a read transaction pins one snapshot without blocking
+    # writers, and stops their commits from restarting the copy on every step.
+    # VACUUM INTO reads a single snapshot on its own and can't run in one.
+    journal_mode = source.execute("PRAGMA journal_mode").fetchone()[0]
+    snapshot = not vacuum and journal_mode == "wal"
+    if snapshot:
+        source.execute("BEGIN")
+        source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+    try:
+        if vacuum:
+            source.execute("VACUUM INTO ?", (str(partial),))
+            if progress is not None:
+                pages = source.execute("PRAGMA page_count").fetchone()[0]
+                progress(sqlite3.SQLITE_DONE, 0, pages)
+        else:
+            dest = sqlite3.connect(partial)
+            try:
+                source.backup(
+                    dest, pages=pages_per_step, progress=progress, sleep=sleep
+                )
+            finally:
+                dest.close()
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        if snapshot:
+            source.execute("ROLLBACK")
+
+    os.replace(partial, target)
+    return target
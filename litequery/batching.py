@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class _Write:
+    sql: str
+    op: object
+    parameters: dict
+    future: Future = field(default_factory=Future)
+
+
+class WriteBatcher:
+    """Background writer that commits queued writes together.
+
+    Writes are collected until `max_size` statements are queued or `max_delay`
+    seconds passed since the first one, then run in a single transaction.
+    With no delay, whatever queued up while the previous batch was committing
+    goes into the next one. Every caller gets its own result or exception once
+    the batch commits.
+    """
+
+    def __init__(self, lq, max_delay: float = 0.0, max_size: int = 256):
+        self._lq = lq
+        self._max_delay = max_delay
+        self._max_size = max_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, sql: str, op, parameters: dict) -> Future:
+        if self._thread is None:
+            self._start()
+        write = _Write(sql, op, parameters)
+        self._queue.put(write)
+        return write.future
+
+    def _start(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write batcher is closed.")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="litequery-group-commit", daemon=True
+                )
+                self._thread.start()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                break
+
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    write = self._queue.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if write is None:
+                    running = False
+                    break
+                batch.append(write)
+
+            self._commit(batch)
+
+        self._lq._close_thread_connection()
+
+    def _commit(self, batch: list[_Write]):
+        with self._lq._connection() as conn:
+            while batch:
+                outcomes: list[tuple[_Write, Any, Exception | None]] = []
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                except Exception as e:
+                    _settle([(write, None, e) for write in batch])
+                    return
+                for write in batch:
+                    try:
+                        result = self._lq._fetch(
+                            conn, write.sql, write.op, write.parameters
+                        )
+                        outcomes.append((write, result, None))
+                    except Exception as e:
+                        outcomes.append((write, None, e))
+                        if not conn.in_transaction:
+                            # The error rolled back the whole transaction, so
+                            # replay the rest of the batch without this write.
+                            break
+                else:
+                    try:
+                        conn.execute("COMMIT")
+                    except Exception as e:
+                        if conn.in_transaction:
+                            conn.rollback()
+                        outcomes = [(w, None, e) for w, _, _ in outcomes]
+                    _settle(outcomes)
+                    return
+
+                failed, _, error = outcomes[-1]
+                failed.future.set_exception(error)
+                batch = [write for write in batch if write is not failed]
+
+
+def _settle(outcomes):
+    for write, result, error in outcomes:
+        if error is not None:
+            write.future.set_exception(error)
+        else:
+            write.future.set_result(result)
@@ -0,0 +1,221 @@
+import json
+import platform
+import sqlite3
+import tempfile
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+import litequery
+from litequery.core import Litequery, parse_queries
+
+ROWS = 1000
+CATALOG_QUERIES = 200
+
+SCHEMA = """
+create table items (
+    id integer primary key,
+    name text not null,
+    price real not null,
+    stock integer not null,
+    created_at datetime not null
+);
+"""
+
+QUERIES = """
+-- name: get_items
+select * from items limit :limit;
+
+-- name: get_items_by_ids
+select * from items where id in (:ids);
+
+-- name: update_stock!
+update items set stock = :stock where id = :id;
+"""
+
+
+@dataclass(slots=True)
+class Item:
+    id: int
+    name: str
+    price: float
+    stock: int
+    created_at: datetime
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops_per_sec: float
+    # Peak memory traced by tracemalloc during a single operation.
+    peak_bytes: int
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+
+def _catalog(count: int) -> str:
+    blocks = []
+    for i in range(count):
+        blocks.append(
+            f"-- name: get_item_{i}^\n"
+            "-- cache: ttl=60\n"
+            f"select * from items where id = :id and stock > :min_stock_{i};\n"
+        )
+    return "\n".join(blocks)
+
+
+@contextmanager
+def synthetic_database() -> Iterator[Litequery]:
+    """Litequery over a temporary database filled with generated rows."""
+    with tempfile.TemporaryDirectory(prefix="litequery-bench-") as name:
+        directory = Path(name)
+        db_path = directory / "bench.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(SCHEMA)
+            conn.executemany(
+                "insert into items values (?, ?, ?, ?, ?)",
+                (
+                    (i, f"item {i}", i * 0.5, i % 100, f"2024-01-01 00:{i % 60:02}:00")
+                    for i in range(1, ROWS + 1)
+                ),
+            )
+        conn.close()
+        queries_path = directory / "queries"
+        queries_path.mkdir()
+        (queries_path / "items.sql").write_text(QUERIES)
+        (directory / "catalog.sql").write_text(_catalog(CATALOG_QUERIES))
+
+        lq = litequery.setup(str(db_path), str(queries_path))
+        try:
+            yield lq
+        finally:
+            lq.close()
+
+
+def hot_paths(lq: Litequery) -> dict[str, Callable[[], object]]:
+    """One operation per hot path, keyed by the name results are reported under."""
+    rows = lq.get_items(limit=ROWS)
+    ids = list(range(1, 101))
+    catalog = lq.config.database_path.parent / "catalog.sql"
+    sql = lq._queries["get_items_by_ids"].sql
+
+    def transaction():
+        with lq.transaction():
+            lq.update_stock(stock=1, id=1)
+
+    return {
+        "fetch_rows": lambda: lq.get_items(limit=ROWS),
+        "row_access": lambda: [(r.id, r["name"], r.price) for r in rows],
+        "datetime_conversion": lambda: [r.created_at for r in lq.get_items(limit=ROWS)],
+        "rows_into": lambda: rows.into(Item),
+        "expand_parameters": lambda: lq._expand_parameters(sql, {"ids": ids}),
+        "parse_queries": lambda: parse_queries(catalog),
+        "transaction": transaction,
+    }
+
+
+def measure(
+    name: str, fn: Callable[[], object], repeat: int = 5, number: int | None = None
+) -> BenchResult:
+    fn()  # Warm up caches and connections.
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number))
+
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return BenchResult(name, number / best, peak)
+
+
+def run_micro(
+    select: str | None = None,
+    repeat: int = 5,
+    number: int | None = None,
+    report: Callable[[BenchResult], object] | None = None,
+) -> list[BenchResult]:
+    """Measure every hot path, or those whose name contains `select`."""
+    results = []
+    with synthetic_database() as lq:
+        for name, fn in hot_paths(lq).items():
+            if select and select not in name:
+                continue
+            result = measure(name, fn, repeat, number)
+            results.append(result)
+            if report is not None:
+                report(result)
+    return results
+
+
+def save_baseline(path: str | Path, results: list[BenchResult]):
+    data = {
+        "litequery": litequery.__version__,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "results": {r.name: asdict(r) for r in results},
+    }
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
+def load_baseline(path: str | Path) -> dict[str, BenchResult]:
+    data = json.loads(Path(path).read_text())
+    return {name: BenchResult(**r) for name, r in data["results"].items()}
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: dict[str, BenchResult],
+    threshold: float = 0.15,
+) -> list[Regression]:
+    """Results that got slower, or used more memory, by more than `threshold`."""
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if result.ops_per_sec < base.ops_per_sec * (1 - threshold):
+            regressions.append(
+                Regression(
+                    result.name, "ops_per_sec", base.ops_per_sec, result.ops_per_sec
+                )
+            )
+        if result.peak_bytes > base.peak_bytes * (1 + threshold):
+            regressions.append(
+                Regression(
+                    result.name, "peak_bytes", base.peak_bytes, result.peak_bytes
+                )
+            )
+    return regressions
+
+
+def format_result(result: BenchResult) -> str:
+    return (
+        f"{result.name:<22} {result.ops_per_sec:>14,.0f} ops/sec "
+        f"{result.peak_bytes / 1024:>10,.1f} KiB peak"
+    )
+
+
+def format_regression(regression: Regression) -> str:
+    return (
+        f"{regression.name}: {regression.metric} {regression.baseline:,.0f} -> "
+        f"{regression.current:,.0f} ({regression.change:+.1%})"
+    )
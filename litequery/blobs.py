@@ -0,0 +1,56 @@
+import os
+import sqlite3
+from collections.abc import Iterator
+from typing import IO
+
+CHUNK_SIZE = 65536
+
+
+def iter_chunks(blob: sqlite3.Blob, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    while chunk := blob.read(chunk_size):
+        yield chunk
+
+
+def copy_to(blob: sqlite3.Blob, out: IO[bytes], chunk_size: int = CHUNK_SIZE) -> int:
+    count = 0
+    for chunk in iter_chunks(blob, chunk_size):
+        out.write(chunk)
+        count += len(chunk)
+    return count
+
+
+def read_into(
+    blob: sqlite3.Blob, buffer, offset: int = 0, chunk_size: int = CHUNK_SIZE
+) -> memoryview:
+    """Fill `buffer` from the blob, starting at `offset`, without growing bytes.
+
+    Returns a view of the part of `buffer` that was filled.
+    """
+    view = memoryview(buffer).cast("B")
+    size = max(0, min(len(blob) - offset, len(view)))
+    blob.seek(offset)
+    for start in range(0, size, chunk_size):
+        end = min(start + chunk_size, size)
+        view[start:end] = blob.read(end - start)
+    return view[:size]
+
+
+def copy_from(
+    blob: sqlite3.Blob, source: IO[bytes], chunk_size: int = CHUNK_SIZE
+) -> int:
+    # Blobs can't grow, so reads stop at the size it was allocated with.
+    count, size = 0, len(blob)
+    while count < size and (chunk := source.read(min(chunk_size, size - count))):
+        blob.write(chunk)
+        count += len(chunk)
+    return count
+
+
+def source_size(source: IO[bytes]) -> int:
+    try:
+        return os.fstat(source.fileno()).st_size - source.tell()
+    except (AttributeError, OSError):
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END) - position
+        source.seek(position)
+        return size
@@ -0,0 +1,223 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+TOKEN = re.compile(
+    r"""'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/"""  # Literals and comments, skipped.
+    r"""|"((?:[^"]|"")*)"|`([^`]*)`|\[([^\]]*)\]|(\w+)|(\S)""",
+    re.DOTALL,
+)
+# Keywords followed by a table name.
+TABLE_KEYWORDS = frozenset({"from", "join", "into", "update", "table"})
+# Keywords that end the table list of a FROM clause.
+CLAUSE_KEYWORDS = frozenset(
+    {
+        "where", "group", "having", "order", "limit", "window", "union",
+        "intersect", "except", "on", "using", "returning", "set", "values",
+        "select", "natural", "left", "right", "full", "inner", "outer", "cross",
+    }
+)  # fmt: skip
+READ_ONLY = re.compile(r"\s*(?:select|values|explain)\b", re.IGNORECASE)
+# Stands for every table, for writes whose tables can't be told from the SQL.
+EVERY_TABLE = frozenset({"*"})
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+@dataclass
+class CachePolicy:
+    size: int = 1024
+    ttl: float | None = None
+
+    @classmethod
+    def parse(cls, directive: str) -> "CachePolicy":
+        policy = cls()
+        for option in directive.split():
+            key, _, value = option.partition("=")
+            if key == "size":
+                policy.size = int(value)
+            elif key == "ttl":
+                policy.ttl = float(value)
+            else:
+                raise ValueError(f"Unknown cache option: '{option}'")
+        return policy
+
+
+@lru_cache(maxsize=1024)
+def referenced_tables(sql: str) -> frozenset[str]:
+    """Tables named after FROM, JOIN, INTO or UPDATE, including FROM lists."""
+    tables = set()
+    expect_table = False
+    # Whether a comma starts another table, one level per open parenthesis.
+    in_table_list = [False]
+    previous = ""
+    for match in TOKEN.finditer(sql):
+        quoted = match[1] or match[2] or match[3]
+        word, symbol = match[4], match[5]
+        if quoted is None and word is None and symbol is None:
+            continue
+        if symbol == "." and previous:
+            # A schema-qualified name, the table comes after the dot.
+            tables.discard(previous)
+            expect_table = True
+            continue
+        previous = ""
+        if expect_table:
+            expect_table = False
+            if quoted is not None or word is not None:
+                previous = (quoted or word).lower()
+                tables.add(previous)
+                continue
+        if word is not None:
+            keyword = word.lower()
+            if keyword in TABLE_KEYWORDS:
+                expect_table = True
+                in_table_list[-1] = keyword == "from"
+            elif keyword in CLAUSE_KEYWORDS:
+                in_table_list[-1] = False
+        elif symbol == "(":
+            in_table_list.append(False)
+        elif symbol == ")":
+            if len(in_table_list) > 1:
+                in_table_list.pop()
+        elif symbol == "," and in_table_list[-1]:
+            expect_table = True
+    return frozenset(tables)
+
+
+def written_tables(sql: str) -> frozenset[str]:
+    return referenced_tables(sql) or EVERY_TABLE
+
+
+@lru_cache(maxsize=1024)
+def reads_only(sql: str) -> bool:
+    return READ_ONLY.match(sql) is not None
+
+
+class QueryCache:
+    def __init__(self, policy: CachePolicy, tables: frozenset[str]):
+        self.policy = policy
+        self.tables = tables
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires is None or expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.evictions += 1
+        self.misses += 1
+        return MISSING
+
+    def put(self, key, value):
+        ttl = self.policy.ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.generation += 1
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
+
+
+class ResultCache:
+    """LRU/TTL cache of read query results, invalidated per table.
+
+    Only queries declaring a `-- cache:` directive are cached. Writes made
+    through the same Litequery clear every cached query that reads from one
+    of the tables they name. Tables changed by triggers or foreign key
+    cascades, or read through views, aren't tracked.
+    """
+
+    def __init__(self) -> None:
+        self._queries: dict[str, QueryCache] = {}
+        self._by_table: dict[str, list[QueryCache]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, sql: str, policy: CachePolicy):
+        cache = QueryCache(policy, referenced_tables(sql))
+        self._queries[name] = cache
+        for table in cache.tables:
+            self._by_table.setdefault(table, []).append(cache)
+
+    def caches(self, name: str) -> bool:
+        return name in self._queries
+
+    def get(self, name: str, key) -> tuple[Any, int]:
+        with self._lock:
+            cache = self._queries[name]
+            return cache.get(key), cache.generation
+
+    def put(self, name: str, key, value, generation: int):
+        with self._lock:
+            cache = self._queries[name]
+            # Skip results that raced with a write invalidating this query.
+            if cache.generation == generation:
+                cache.put(key, value)
+
+    def invalidate(self, tables: frozenset[str]):
+        if "*" in tables:
+            self.clear()
+            return
+        with self._lock:
+            for table in tables:
+                for cache in self._by_table.get(table, ()):
+                    cache.clear()
+
+    def clear(self):
+        with self._lock:
+            for cache in self._queries.values():
+                cache.clear()
+
+    def stats(self) -> dict[str, CacheStats]:
+        with self._lock:
+            return {name: cache.stats() for name, cache in self._queries.items()}
+
+
+def cache_key(parameters: dict, into=None):
+    try:
+        items = tuple(
+            sorted(
+                (k, tuple(v) if isinstance(v, list) else v)
+                for k, v in parameters.items()
+            )
+        )
+        hash(items)
+    except TypeError:
+        return None
+    return items, into
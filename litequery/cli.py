@@ -1,8 +1,32 @@
 import argparse
+import json
+import sqlite3
+import sys
+import time
 
+from litequery.backup import backup
+from litequery.bench import (
+    compare,
+    format_regression,
+    format_result,
+    load_baseline,
+    run_micro,
+    save_baseline,
+)
 from litequery.config import get_config
+from litequery.core import READ_OPS, ROUTING, Litequery, load_queries
+from litequery.maintenance import CHECKPOINT_MODES, maintain
 from litequery.migrations import create_migration, migrate
+from litequery.planner import QueryPlan, explain_queries
 from litequery.shell import start_shell
+from litequery.transfer import (
+    FORMATS,
+    export_rows,
+    guess_format,
+    import_records,
+    quote_identifier,
+    read_records,
+)
 
 
 def main():
@@ -21,16 +45,139 @@ def main():
         "name", help="Migration name (e.g., 'add users table')"
     )
 
-    subparsers.add_parser("migrate", help="Run database migrations")
+    migrate_parser = subparsers.add_parser("migrate", help="Run database migrations")
+    migrate_parser.add_argument(
+        "--dry-run", action="store_true", help="List pending migrations and exit"
+    )
+    migrate_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Apply all pending migrations in a single transaction",
+    )
     subparsers.add_parser("shell", help="Start SQLite shell")
 
+    maintain_parser = subparsers.add_parser(
+        "maintain", help="Checkpoint the WAL, refresh statistics and vacuum"
+    )
+    maintain_parser.add_argument(
+        "--checkpoint",
+        choices=sorted(mode.lower() for mode in CHECKPOINT_MODES),
+        default="truncate",
+        help="WAL checkpoint mode (default: truncate)",
+    )
+    maintain_parser.add_argument(
+        "--no-optimize", action="store_true", help="Skip PRAGMA optimize"
+    )
+    maintain_parser.add_argument(
+        "--vacuum-pages",
+        type=int,
+        default=None,
+        help="Pages to free with incremental vacuum (default: all)",
+    )
+
+    backup_parser = subparsers.add_parser(
+        "backup", help="Back up the database while it stays online"
+    )
+    backup_parser.add_argument("target", help="Path of the backup file")
+    backup_parser.add_argument(
+        "--pages-per-step",
+        type=int,
+        default=1024,
+        help="Pages copied per step, -1 copies everything at once (default: 1024)",
+    )
+    backup_parser.add_argument(
+        "--sleep", type=float, default=0.0, help="Seconds to pause between steps"
+    )
+    backup_parser.add_argument(
+        "--vacuum", action="store_true", help="Write a compacted copy (VACUUM INTO)"
+    )
+
+    check_parser = subparsers.add_parser(
+        "check", help="Flag named queries with slow query plans"
+    )
+    check_parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Print every query plan"
+    )
+
+    export_parser = subparsers.add_parser(
+        "export", help="Stream a named query or a table to CSV/NDJSON"
+    )
+    export_parser.add_argument("source", help="Named query or table name")
+    export_parser.add_argument(
+        "-o", "--output", help="Output file (default: stdout)", default=None
+    )
+    export_parser.add_argument("--format", choices=FORMATS, default=None)
+    export_parser.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Query parameter, VALUE is parsed as JSON when possible",
+    )
+
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk-load CSV/NDJSON rows into a table"
+    )
+    import_parser.add_argument("table", help="Table to insert into")
+    import_parser.add_argument("file", help="Input file, '-' reads stdin")
+    import_parser.add_argument("--format", choices=FORMATS, default=None)
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50_000,
+        help="Rows per transaction (default: 50000)",
+    )
+    import_parser.add_argument(
+        "--no-sync",
+        action="store_true",
+        help="Run with synchronous=off, a crash during the import may corrupt it",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Measure litequery's hot paths on a synthetic database"
+    )
+    bench_parser.add_argument(
+        "--micro", action="store_true", help="Run the micro-benchmark suite"
+    )
+    bench_parser.add_argument(
+        "-k", "--select", help="Only run benchmarks whose name contains this"
+    )
+    bench_parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing rounds, the best one counts"
+    )
+    bench_parser.add_argument("--save", metavar="PATH", help="Save results as JSON")
+    bench_parser.add_argument(
+        "--baseline", metavar="PATH", help="Fail on regressions against this JSON"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Allowed slowdown or memory growth (default: 0.15)",
+    )
+
     args = parser.parse_args()
+    if args.command == "bench":
+        # Benchmarks use a database of their own, not the configured one.
+        run_bench(args)
+        return
     config = get_config()
 
     if args.command == "migrate":
-        migrate(config)
+        migrate(config, dry_run=args.dry_run, batch=args.batch)
     elif args.command == "shell":
         start_shell(config)
+    elif args.command == "maintain":
+        run_maintain(config, args)
+    elif args.command == "backup":
+        run_backup(config, args)
+    elif args.command == "check":
+        run_check(config, args)
+    elif args.command == "export":
+        run_export(config, args)
+    elif args.command == "import":
+        run_import(config, args)
     elif args.command == "new":
         if args.new_command == "migration":
             create_migration(args.name, config)
@@ -45,5 +192,173 @@ def main():
         print(f"Unknown command: {args.command}")
 
 
+def run_maintain(config, args):
+    conn = sqlite3.connect(config.database_path, autocommit=True)
+    try:
+        report = maintain(
+            conn,
+            config.database_path,
+            args.checkpoint,
+            analyze=not args.no_optimize,
+            vacuum_pages=args.vacuum_pages,
+        )
+    finally:
+        conn.close()
+
+    if report.checkpoint is not None:
+        busy, frames, checkpointed = report.checkpoint
+        status = " (busy)" if busy else ""
+        print(f"Checkpointed {checkpointed} of {frames} WAL frames{status}.")
+    else:
+        print("WAL is empty, nothing to checkpoint.")
+    if report.optimized:
+        print("Ran PRAGMA optimize.")
+    print(f"Freed {report.vacuumed_pages} pages.")
+
+
+def run_backup(config, args):
+    def progress(status, remaining, total):
+        print(f"\rCopied {total - remaining} of {total} pages", end="", flush=True)
+
+    conn = sqlite3.connect(config.database_path, autocommit=True)
+    try:
+        target = backup(
+            conn, args.target, args.pages_per_step, args.sleep, progress, args.vacuum
+        )
+    finally:
+        conn.close()
+    print(f"\nBacked up {config.database_path} to {target}.")
+
+
+def run_bench(args):
+    if not args.micro:
+        sys.exit(
+            "Error: only --micro is available, "
+            "run the other benchmarks with python -m benchmarks.bench_<name>"
+        )
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    results = run_micro(
+        args.select, args.repeat, report=lambda r: print(format_result(r))
+    )
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Saved {len(results)} results to {args.save}")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {format_regression(regression)}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}.")
+
+
+def run_check(config, args):
+    queries = load_queries(config.queries_path)
+    # The CLI has no routing config, so it can't open the databases these use.
+    local = [q for q in queries if ROUTING.isdisjoint(q.directives)]
+    routed = [q for q in queries if not ROUTING.isdisjoint(q.directives)]
+    conn = sqlite3.connect(config.database_path, autocommit=True)
+    try:
+        plans = explain_queries(conn, local)
+    finally:
+        conn.close()
+    plans += [
+        QueryPlan(q.name, skipped="routed to another database, use lq.explain_all()")
+        for q in routed
+    ]
+
+    flagged = 0
+    for plan in plans:
+        if plan.skipped:
+            print(f"{plan.name}\n  skipped: {plan.skipped}")
+            continue
+        if not plan.issues and not args.verbose:
+            continue
+        flagged += bool(plan.issues)
+        print(plan.name)
+        if args.verbose:
+            for detail in plan.plan:
+                print(f"  | {detail}")
+        for issue in plan.issues:
+            print(f"  {issue.kind}: {issue.detail}")
+            if issue.suggestion:
+                print(f"    suggestion: {issue.suggestion}")
+
+    skipped = sum(plan.skipped is not None for plan in plans)
+    print(
+        f"Checked {len(plans) - skipped} queries, {flagged} with issues"
+        + (f", {skipped} skipped." if skipped else ".")
+    )
+    if flagged:
+        sys.exit(1)
+
+
+def _parse_param(param: str):
+    name, _, value = param.partition("=")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def _report(action: str, count: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    print(
+        f"{action} {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec).",
+        file=sys.stderr,
+    )
+
+
+def run_export(config, args):
+    queries = load_queries(config.queries_path)
+    query = next((q for q in queries if q.name == args.source), None)
+    if query is not None and query.op not in READ_OPS:
+        sys.exit(f"Error: query '{args.source}' doesn't return rows")
+    if query is None and args.param:
+        sys.exit(f"Error: '{args.source}' is a table, -p needs a named query")
+    parameters = dict(map(_parse_param, args.param))
+    fmt = args.format or guess_format(args.output)
+
+    # Named queries run through Litequery, which expands list parameters.
+    lq = Litequery(config, queries)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        started = time.perf_counter()
+        with lq._connection(write=False) as conn:
+            if query is not None:
+                sql, parameters = lq._expand_parameters(query.sql, parameters)
+            else:
+                sql = f"select * from {quote_identifier(args.source)}"
+            count = export_rows(conn.execute(sql, parameters), out, fmt)
+    except (sqlite3.Error, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        lq.close()
+    _report("Exported", count, started)
+
+
+def run_import(config, args):
+    fmt = args.format or guess_format(args.file)
+    conn = sqlite3.connect(config.database_path, autocommit=True)
+    file = sys.stdin if args.file == "-" else open(args.file, newline="")
+    try:
+        if args.no_sync:
+            conn.execute("PRAGMA synchronous = off")
+        started = time.perf_counter()
+        count = import_records(
+            conn, args.table, read_records(file, fmt), args.batch_size
+        )
+    except sqlite3.Error as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        if file is not sys.stdin:
+            file.close()
+        conn.close()
+    _report("Imported", count, started)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+import sqlite3
+from array import array
+
+from litequery.converters import split_column
+
+TYPECODES = {int: "q", float: "d"}
+
+
+class Columns(dict):
+    """Query result as a mapping of column name to column values.
+
+    Columns holding only integers or only reals (integers mixed in are fine)
+    are packed into `array.array`, anything else stays a plain list.
+    """
+
+    def to_numpy(self) -> dict:
+        import numpy as np  # type: ignore[import-not-found]
+
+        return {
+            name: (
+                np.frombuffer(values, dtype=values.typecode)
+                if isinstance(values, array)
+                else np.array(values, dtype=object)
+            )
+            for name, values in self.items()
+        }
+
+
+def _typecode(values: tuple) -> str | None:
+    kinds = set(map(type, values))
+    if len(kinds) == 1:
+        return TYPECODES.get(kinds.pop())
+    if kinds == {int, float}:
+        return "d"
+    return None
+
+
+def _new_column(values: tuple):
+    typecode = _typecode(values)
+    if typecode is not None:
+        try:
+            return array(typecode, values)
+        except OverflowError:
+            pass
+    return list(values)
+
+
+def _extend_column(column, values: tuple):
+    if isinstance(column, list):
+        column.extend(values)
+        return column
+    size = len(column)
+    try:
+        column.extend(values)
+        return column
+    except (TypeError, OverflowError):
+        # A later batch didn't fit the type guessed from the first one.
+        del column[size:]
+        return [*column, *values]
+
+
+def fetch_columns(cursor: sqlite3.Cursor, batch_size: int) -> Columns:
+    try:
+        cursor.row_factory = None
+        names = [split_column(column[0])[0] for column in cursor.description or ()]
+        columns: list = [[] for _ in names]
+        first = True
+        while batch := cursor.fetchmany(batch_size):
+            for i, values in enumerate(zip(*batch)):
+                if first:
+                    columns[i] = _new_column(values)
+                else:
+                    columns[i] = _extend_column(columns[i], values)
+            first = False
+        return Columns(zip(names, columns))
+    finally:
+        cursor.close()
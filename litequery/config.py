@@ -1,8 +1,10 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 
+from litequery.pragmas import PROFILES, parse_pragmas
+
 
 def get_database_path() -> Path:
     db_path = os.getenv("DATABASE_PATH")
@@ -37,6 +39,11 @@ class Config:
     database_path: Path
     queries_path: Path
     migrations_path: Path
+    profile: str = "default"
+    pragmas: dict[str, str | int] = field(default_factory=dict)
+    databases: dict[str, Path] = field(default_factory=dict)
+    shards: dict[str, list[Path] | Path] = field(default_factory=dict)
+    attach: dict[str, Path] = field(default_factory=dict)
 
     def ensure_directories(self):
         self.database_path.parent.mkdir(parents=True, exist_ok=True)
@@ -44,7 +51,15 @@ class Config:
         self.migrations_path.mkdir(parents=True, exist_ok=True)
 
 
-def get_config(db_path: str | None = None, queries_path: str | None = None):
+def get_config(
+    db_path: str | None = None,
+    queries_path: str | None = None,
+    profile: str | None = None,
+    pragmas: dict[str, str | int] | None = None,
+    databases: dict[str, str] | None = None,
+    shards: dict[str, list[str] | str] | None = None,
+    attach: dict[str, str] | None = None,
+):
     database_path = Path(db_path).resolve() if db_path else get_database_path()
     queries_path = Path(queries_path).resolve() if queries_path else queries_path
 
@@ -56,10 +71,33 @@ def get_config(db_path: str | None = None, queries_path: str | None = None):
     queries_path = queries_path or queries_found or (root_dir / "queries")
     migrations_path = migrations_found or (root_dir / "migrations")
 
+    profile = profile or os.getenv("LITEQUERY_PROFILE") or "default"
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown pragma profile '{profile}'. "
+            f"Available profiles: {', '.join(PROFILES)}"
+        )
+    pragmas = {**parse_pragmas(os.getenv("LITEQUERY_PRAGMAS", "")), **(pragmas or {})}
+
+    def resolve(path: str) -> Path:
+        return (root_dir / path).resolve()
+
+    for name in (*(databases or {}), *(shards or {}), *(attach or {})):
+        if not name.isidentifier():
+            raise ValueError(f"Invalid database name '{name}'.")
+
     config = Config(
         database_path=database_path,
         queries_path=queries_path,
         migrations_path=migrations_path,
+        profile=profile,
+        pragmas=pragmas,
+        databases={name: resolve(path) for name, path in (databases or {}).items()},
+        shards={
+            name: resolve(spec) if isinstance(spec, str) else list(map(resolve, spec))
+            for name, spec in (shards or {}).items()
+        },
+        attach={name: resolve(path) for name, path in (attach or {}).items()},
     )
     config.ensure_directories()
 
@@ -0,0 +1,138 @@
+import json
+import re
+import sqlite3
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+Converter = Callable[[bytes], Any]
+
+# Like sqlite3, the converter name is the type up to its first space or "(".
+TYPE_NAME_END = re.compile(r"[\s(]")
+COLUMN_TYPE = re.compile(r"(.*?) ?\[([^\]]*)\].*", re.DOTALL)
+PARAMETER = re.compile(r"[:@$]\w+|\?\d*")
+TYPES_VIEW = "_litequery_types"
+
+
+class Pending:
+    """Stored value of a typed column, converted when the column is first read."""
+
+    __slots__ = ("value", "converter")
+
+    def __init__(self, value: Any, converter: Converter):
+        self.value = value
+        self.converter = converter
+
+    def convert(self) -> Any:
+        return self.converter(raw_bytes(self.value))
+
+
+def raw_bytes(value: Any) -> bytes:
+    # Converters take the value as bytes, like sqlite3 hands it to its own.
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+def split_column(name: str) -> tuple[str, str | None]:
+    """Split an `AS 'name [type]'` alias into its name and type, if it has one."""
+    match = COLUMN_TYPE.fullmatch(name)
+    if match is None:
+        return name, None
+    return match[1], match[2].lower()
+
+
+def declared_types(conn: sqlite3.Connection, sql: str) -> tuple[str | None, ...]:
+    """Declared type of each result column of `sql`, or () if they can't be read.
+
+    sqlite3 only passes declared types to its process-wide converters, so they
+    are read from a temporary view over the statement instead.
+    """
+    select = PARAMETER.sub("null", sql.strip().rstrip(";"))
+    (query_only,) = conn.execute("PRAGMA query_only").fetchone()
+    try:
+        if query_only:
+            conn.execute("PRAGMA query_only = 0")
+        conn.execute(f"CREATE TEMP VIEW {TYPES_VIEW} AS {select}")
+        try:
+            columns = conn.execute(f"PRAGMA temp.table_info({TYPES_VIEW})").fetchall()
+        finally:
+            conn.execute(f"DROP VIEW temp.{TYPES_VIEW}")
+    except sqlite3.Error:
+        # Statements a view can't hold, like writes with RETURNING.
+        return ()
+    finally:
+        if query_only:
+            conn.execute("PRAGMA query_only = 1")
+    return tuple(
+        TYPE_NAME_END.split(column[2], 1)[0].lower() or None for column in columns
+    )
+
+
+def convert_datetime(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode())
+
+
+def convert_epoch(value: bytes) -> datetime:
+    return datetime.fromtimestamp(float(value), UTC).replace(tzinfo=None)
+
+
+def convert_decimal(value: bytes) -> Decimal:
+    return Decimal(value.decode())
+
+
+FAST_CONVERTERS: dict[str, Converter] = {
+    "datetime": convert_datetime,
+    "epoch": convert_epoch,
+    "json": json.loads,
+    "decimal": convert_decimal,
+}
+
+
+class Converters:
+    """Converters of one Litequery instance, keyed by column type name.
+
+    Types this instance has no converter for come back as they are stored.
+    """
+
+    def __init__(self, converters: Mapping[str, Converter | str | None]):
+        self.converters: dict[str, Converter] = {}
+        for name, converter in converters.items():
+            if converter is None:
+                continue
+            if isinstance(converter, str):
+                if converter not in FAST_CONVERTERS:
+                    raise ValueError(f"Unknown converter '{converter}'.")
+                converter = FAST_CONVERTERS[converter]
+            self.converters[name.lower()] = converter
+
+    def column_converters(
+        self, description, declared: tuple[str | None, ...] = ()
+    ) -> tuple[tuple[int, Converter], ...]:
+        """Converter of each typed column, by its alias or its declared type."""
+        found = []
+        for i, column in enumerate(description):
+            type_name = split_column(column[0])[1]
+            if type_name is None and i < len(declared):
+                type_name = declared[i]
+            converter = self.converters.get(type_name) if type_name else None
+            if converter is not None:
+                found.append((i, converter))
+        return tuple(found)
+
+    @staticmethod
+    def convert_row(row: tuple, columns: tuple[tuple[int, Converter], ...]) -> tuple:
+        values = list(row)
+        for i, converter in columns:
+            if values[i] is not None:
+                values[i] = converter(raw_bytes(values[i]))
+        return tuple(values)
+
+    @staticmethod
+    def convert_column(values, converter: Converter) -> list:
+        return [None if v is None else converter(raw_bytes(v)) for v in values]
+
+
+# Leaves every typed column as it is stored, for queries with `convert: off`.
+RAW = Converters({})
@@ -1,19 +1,71 @@
+import copy
 import glob
 import inspect
+import json
+import marshal
 import os
+import random
 import re
 import sqlite3
 import threading
-from collections.abc import Iterator
-from contextlib import contextmanager
-from dataclasses import dataclass
+import time
+from collections import defaultdict
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from datetime import UTC, datetime
 from enum import Enum
-from functools import lru_cache
+from functools import lru_cache, partial
+from itertools import chain, groupby, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, TypedDict
 
+from litequery.backup import Progress
+from litequery.backup import backup as run_backup
+from litequery.batching import WriteBatcher
+from litequery.blobs import (
+    CHUNK_SIZE,
+    copy_from,
+    copy_to,
+    iter_chunks,
+    read_into,
+    source_size,
+)
+from litequery.cache import (
+    MISSING,
+    CachePolicy,
+    ResultCache,
+    cache_key,
+    reads_only,
+    written_tables,
+)
+from litequery.columnar import Columns, fetch_columns
 from litequery.config import Config, get_config
+from litequery.converters import (
+    RAW,
+    Converter,
+    Converters,
+    Pending,
+    convert_datetime,
+    declared_types,
+    split_column,
+)
+from litequery.instrumentation import Instrumentation, QueryEvent, parameters_shape
+from litequery.maintenance import Maintenance, MaintenanceReport
+from litequery.maintenance import maintain as run_maintenance
+from litequery.planner import QueryPlan, explain_queries
+from litequery.pool import ConnectionPool
+from litequery.pragmas import (
+    BULK_LOAD_PRAGMAS,
+    PROFILES,
+    WRITER_ONLY,
+    merge_pragmas,
+    pragma_statements,
+)
+from litequery.sharding import HashShards, TimeShards, parse_shard_directive
+from litequery.transfer import quote_identifier
 
 
 class Op(str, Enum):
@@ -24,53 +76,130 @@ class Op(str, Enum):
     INSERT_RETURNING = "<!"
 
 
+PLACEHOLDER = re.compile(r":(\w+)")
+READ_OPS = frozenset({Op.SELECT, Op.SELECT_ONE, Op.SELECT_VALUE})
+WRITE_OPS = frozenset({Op.MODIFY, Op.INSERT_RETURNING})
+ROUTING = frozenset({"database", "shard"})
+RAW_QUERIES = frozenset({"raw", "raw_one", "raw_value"})
+TRANSACTION_MODES = frozenset({"DEFERRED", "IMMEDIATE", "EXCLUSIVE"})
+
+
 @dataclass
 class Query:
     name: str
     sql: str
     args: list
     op: Op = Op.SELECT
+    directives: dict[str, str] = field(default_factory=dict)
 
 
-@lru_cache(maxsize=128)
-def _get_fields(cls):
-    sig = inspect.signature(cls)
-    return {p.name for p in sig.parameters.values() if p.name != "self"}
-
-
-class Row:
-    __slots__ = ("_values", "_index")
+class RowShape:
+    __slots__ = ("columns", "index")
 
-    def __init__(self, columns: list[str], values: list[Any]):
+    def __init__(self, columns: tuple[str, ...]):
         if len(set(columns)) != len(columns):
             dups = [c for c in columns if columns.count(c) > 1]
             raise ValueError(f"Duplicate columns: {set(dups)}. Use AS to alias.")
 
+        self.columns = columns
+        self.index = {c: i for i, c in enumerate(columns)}
+
+
+@lru_cache(maxsize=1024)
+def _get_shape(columns: tuple[str, ...]) -> RowShape:
+    return RowShape(tuple([split_column(column)[0] for column in columns]))
+
+
+def get_shape(description) -> RowShape:
+    return _get_shape(tuple(desc[0] for desc in description))
+
+
+def _init_fields(cls) -> list[str]:
+    if is_dataclass(cls):
+        return [f.name for f in fields(cls) if f.init]
+    if isinstance(cls, type) and issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        return list(cls._fields)
+    if hasattr(cls, "__attrs_attrs__"):
+        return [
+            getattr(a, "alias", None) or a.name.lstrip("_")
+            for a in cls.__attrs_attrs__
+            if a.init
+        ]
+    params = inspect.signature(cls).parameters.values()
+    return [
+        p.name
+        for p in params
+        if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) and p.name != "self"
+    ]
+
+
+def _constructor_call(shape: RowShape, cls) -> str:
+    # Builds `cls(id=v[0], name=v[2])` for this result shape, so creating an
+    # instance is a single call with no intermediate dict.
+    args = [
+        f"{name}=v[{shape.index[name]}]"
+        for name in _init_fields(cls)
+        if name in shape.index
+    ]
+    return f"cls({', '.join(args)})"
+
+
+@lru_cache(maxsize=256)
+def compile_constructor(shape: RowShape, cls) -> Callable[[tuple], Any]:
+    return eval(f"lambda v: {_constructor_call(shape, cls)}", {"cls": cls})
+
+
+class Row:
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, shape: RowShape, values: tuple[Any, ...] | list[Any]):
+        self._shape = shape
+        # Becomes a list once a typed column is converted in place.
         self._values = values
-        self._index = {c: i for i, c in enumerate(columns)}
 
     def _available_columns(self) -> str:
-        return ", ".join([f"'{c}'" for c in self._index.keys()])
+        return ", ".join([f"'{c}'" for c in self._shape.columns])
+
+    def _convert(self, i: int, value: Pending) -> Any:
+        # Typed columns are converted the first time they're read, then kept.
+        value = value.convert()
+        values = self._values
+        if not isinstance(values, list):
+            values = self._values = list(values)
+        values[i] = value
+        return value
+
+    def _converted(self) -> tuple[Any, ...] | list[Any]:
+        for i, value in enumerate(self._values):
+            if isinstance(value, Pending):
+                self._convert(i, value)
+        return self._values
 
     def __repr__(self) -> str:
-        items = [f"{col}={self._values[idx]!r}" for col, idx in self._index.items()]
+        values = self._converted()
+        items = [f"{c}={v!r}" for c, v in zip(self._shape.columns, values)]
         return f"{self.__class__.__name__}({', '.join(items)})"
 
     def __getitem__(self, key: int | str) -> Any:
         if isinstance(key, int):
             try:
-                return self._values[key]
+                value = self._values[key]
             except IndexError:
                 raise IndexError(
                     f"Row only has {len(self._values)} columns, "
                     f"can't access index {key}"
                 )
-        try:
-            return self._values[self._index[key]]
-        except KeyError:
-            raise KeyError(
-                f"No column '{key}' found. Available: {self._available_columns()}"
-            )
+        else:
+            try:
+                key = self._shape.index[key]
+            except KeyError:
+                raise KeyError(
+                    f"No column '{key}' found. Available: {self._available_columns()}"
+                )
+            value = self._values[key]
+        if isinstance(value, Pending):
+            return self._convert(key, value)
+        return value
 
     def __getattr__(self, name: str) -> Any:
         error = AttributeError(
@@ -80,77 +209,516 @@ class Row:
             raise error
 
         try:
-            return self._values[self._index[name]]
+            i = self._shape.index[name]
         except KeyError:
             raise error
+        value = self._values[i]
+        if isinstance(value, Pending):
+            return self._convert(i, value)
+        return value
 
     def __len__(self) -> int:
         return len(self._values)
 
     def __iter__(self) -> Iterator[Any]:
-        return iter(self._values)
+        return iter(self._converted())
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Row):
             return False
-        return self._values == other._values
+        return tuple(self._converted()) == tuple(other._converted())
 
     def to_dict(self) -> dict:
-        return dict(zip(self._index.keys(), self._values))
+        return dict(zip(self._shape.columns, self._converted()))
 
     def into(self, cls):
-        fields = _get_fields(cls)
-        return cls(**{k: v for k, v in self.to_dict().items() if k in fields})
+        return compile_constructor(self._shape, cls)(self._converted())
 
 
 class Rows(list):
     def into(self, cls):
-        return Rows([row.into(cls) for row in self])
+        if not self:
+            return Rows()
+        shape = self[0]._shape
+        build = compile_constructor(shape, cls)
+        return Rows(
+            [
+                build(row._converted()) if row._shape is shape else row.into(cls)
+                for row in self
+            ]
+        )
+
+
+class QueryMethod:
+    __slots__ = ("_lq", "query")
+
+    def __init__(self, lq: "Litequery", query: Query):
+        self._lq = lq
+        self.query = query
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.query.name}{self.query.op.value}>"
+
+    def __call__(self, **parameters):
+        return self._lq._execute_query(self.query, parameters)
+
+    def into(self, cls, /, **parameters):
+        if self.query.op not in (Op.SELECT, Op.SELECT_ONE):
+            raise TypeError(f"Query '{self.query.name}' doesn't return rows.")
+        return self._lq._execute_query(self.query, parameters, into=cls)
+
+    def iter(self, batch_size: int = 1000, **parameters) -> Iterator[Row]:
+        if self.query.op not in READ_OPS:
+            raise TypeError(f"Query '{self.query.name}' doesn't return rows.")
+        return self._lq._iter_query(self.query, parameters, batch_size)
+
+    def paginate(
+        self, order_by: str | Iterable[str], page_size: int = 1000, **parameters
+    ) -> Iterator[Rows]:
+        if self.query.op != Op.SELECT:
+            raise TypeError(f"Query '{self.query.name}' doesn't return row lists.")
+        return self._lq._paginate(self.query, order_by, page_size, parameters)
+
+    def columnar(self, batch_size: int = 10_000, **parameters) -> Columns:
+        if self.query.op not in READ_OPS:
+            raise TypeError(f"Query '{self.query.name}' doesn't return rows.")
+        return self._lq._columnar_query(self.query, parameters, batch_size)
+
+    def many(self, parameters: Iterable[dict], chunk_size: int = 10_000):
+        if self.query.op in READ_OPS:
+            raise TypeError(f"Query '{self.query.name}' doesn't modify rows.")
+        return self._lq._execute_many(self.query, parameters, chunk_size)
+
+
+class RoutedQueryMethod(QueryMethod):
+    """Query method that runs on another database than the one it's defined on.
+
+    Its writes commit on that database, where a rollback of the main database
+    can't undo them, so they are refused inside a main database transaction.
+    """
+
+    __slots__ = ("_parent",)
+
+    def __init__(self, lq, query: Query, parent: "Litequery"):
+        super().__init__(lq, query)
+        self._parent = parent
+
+    def _check_write(self):
+        if self.query.op in WRITE_OPS and self._parent._in_transaction():
+            raise RuntimeError(
+                f"Query '{self.query.name}' writes to another database and "
+                "can't run inside a transaction."
+            )
+
+    def __call__(self, **parameters):
+        self._check_write()
+        return super().__call__(**parameters)
+
+    def many(self, parameters: Iterable[dict], chunk_size: int = 10_000):
+        self._check_write()
+        return super().many(parameters, chunk_size)
+
+
+class ShardedQueryMethod(RoutedQueryMethod):
+    """Query method that runs on the shard its key parameter maps to.
+
+    Reads called without the key run on every shard: lists are concatenated in
+    shard order and single rows come from the first shard that has one.
+    """
+
+    __slots__ = ("_key",)
+
+    def __init__(
+        self,
+        shards: HashShards | TimeShards,
+        query: Query,
+        key: str,
+        parent: "Litequery",
+    ):
+        super().__init__(shards, query, parent)
+        self._key = key
+
+    def _shard(self, parameters: dict) -> "Litequery | None":
+        if self._key in parameters:
+            return self._lq.for_key(parameters[self._key])
+        if self.query.op not in (Op.SELECT, Op.SELECT_ONE):
+            raise ValueError(
+                f"Query '{self.query.name}' needs its shard key ':{self._key}'."
+            )
+        return None
+
+    def _merge(self, results: list):
+        if self.query.op == Op.SELECT:
+            return Rows(chain.from_iterable(results))
+        return next((result for result in results if result is not None), None)
+
+    def __call__(self, **parameters):
+        self._check_write()
+        shard = self._shard(parameters)
+        if shard is not None:
+            return shard._execute_query(self.query, parameters)
+        return self._merge(
+            [lq._execute_query(self.query, parameters) for lq in self._lq.all()]
+        )
+
+    def into(self, cls, /, **parameters):
+        if self.query.op not in (Op.SELECT, Op.SELECT_ONE):
+            raise TypeError(f"Query '{self.query.name}' doesn't return rows.")
+        shard = self._shard(parameters)
+        if shard is not None:
+            return shard._execute_query(self.query, parameters, into=cls)
+        return self._merge(
+            [lq._execute_query(self.query, parameters, cls) for lq in self._lq.all()]
+        )
+
+    def iter(self, batch_size: int = 1000, **parameters) -> Iterator[Row]:
+        if self.query.op not in READ_OPS:
+            raise TypeError(f"Query '{self.query.name}' doesn't return rows.")
+        shard = self._shard(parameters)
+        if shard is not None:
+            return shard._iter_query(self.query, parameters, batch_size)
+        return chain.from_iterable(
+            lq._iter_query(self.query, parameters, batch_size) for lq in self._lq.all()
+        )
+
+    def many(self, parameters: Iterable[dict], chunk_size: int = 10_000):
+        if self.query.op in READ_OPS:
+            raise TypeError(f"Query '{self.query.name}' doesn't modify rows.")
+        self._check_write()
+        groups = defaultdict(list)
+        positions = defaultdict(list)
+        for i, row in enumerate(parameters):
+            shard = self._require_shard(row)
+            groups[shard].append(row)
+            positions[shard].append(i)
+
+        results = {
+            shard: shard._execute_many(self.query, rows, chunk_size)
+            for shard, rows in groups.items()
+        }
+        if self.query.op != Op.INSERT_RETURNING:
+            return sum(results.values())
+        ids = [None] * sum(map(len, positions.values()))
+        for shard, shard_ids in results.items():
+            for i, row_id in zip(positions[shard], shard_ids):
+                ids[i] = row_id
+        return ids
+
+    def paginate(
+        self, order_by: str | Iterable[str], page_size: int = 1000, **parameters
+    ) -> Iterator[Rows]:
+        if self.query.op != Op.SELECT:
+            raise TypeError(f"Query '{self.query.name}' doesn't return row lists.")
+        shard = self._require_shard(parameters)
+        return shard._paginate(self.query, order_by, page_size, parameters)
+
+    def columnar(self, batch_size: int = 10_000, **parameters) -> Columns:
+        if self.query.op not in READ_OPS:
+            raise TypeError(f"Query '{self.query.name}' doesn't return rows.")
+        shard = self._require_shard(parameters)
+        return shard._columnar_query(self.query, parameters, batch_size)
+
+    def _require_shard(self, parameters: dict) -> "Litequery":
+        if self._key not in parameters:
+            raise ValueError(
+                f"Query '{self.query.name}' needs its shard key ':{self._key}'."
+            )
+        return self._lq.for_key(parameters[self._key])
+
+
+@dataclass(slots=True)
+class DeferredQuery:
+    method: QueryMethod
+    parameters: dict[str, Any]
+
+    def __call__(self):
+        return self.method(**self.parameters)
+
+
+class DeferredQueries:
+    """Namespace that prepares query calls for `gather` instead of running them."""
+
+    __slots__ = ("_lq",)
+
+    def __init__(self, lq):
+        self._lq = lq
+
+    def __getattr__(self, name: str):
+        method = getattr(self._lq, name)
+        if method.query.op not in READ_OPS:
+            raise TypeError(f"Query '{name}' doesn't return rows.")
+        return lambda **parameters: DeferredQuery(method, parameters)
+
+
+QUERY_BLOCK = re.compile(r"-- name: (.+)\n([\s\S]*?);")
+QUERY_NAME = re.compile(
+    r"^([a-z_][a-z0-9_]*)({})?$".format(
+        "|".join("\\" + "\\".join(list(op.value)) for op in Op if op.value)
+    )
+)
+QUERY_DIRECTIVE = re.compile(r"[ \t]*-- (\w+):(.*)\n")
+OPS_BY_SYMBOL = {op.value: op for op in Op}
+CATALOG_VERSION = 2
 
 
 def parse_file_queries(file_path):
     with open(file_path) as f:
         content = f.read()
-    raw_queries = re.findall(r"-- name: (.+)\n([\s\S]*?);", content)
 
     queries = []
-    op_pattern = "|".join("\\" + "\\".join(list(op.value)) for op in Op if op.value)
-    pattern = rf"^([a-z_][a-z0-9_]*)({op_pattern})?$"
-    for query_name, sql in raw_queries:
-        match = re.match(pattern, query_name)
+    for query_name, sql in QUERY_BLOCK.findall(content):
+        match = QUERY_NAME.match(query_name)
         if not match:
             raise NameError(f'Invalid query name: "{query_name}"')
         query_name = match.group(1)
         op_symbol = match.group(2) or ""
         op = Op(op_symbol)
 
-        args = re.findall(r":(\w+)", sql)
-        query = Query(name=query_name, sql=sql, args=args, op=op)
+        directives = {}
+        while directive := QUERY_DIRECTIVE.match(sql):
+            directives[directive.group(1)] = directive.group(2).strip()
+            sql = sql[directive.end() :]
+
+        args = PLACEHOLDER.findall(sql)
+        query = Query(name=query_name, sql=sql, args=args, op=op, directives=directives)
         queries.append(query)
     return queries
 
 
+def _query_files(path: Path) -> list[str]:
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.sql")))
+    if os.path.isfile(path):
+        return [str(path)]
+    raise ValueError(f"Path {path} is neither a file nor a directory.")
+
+
 def parse_queries(path: Path) -> list[Query]:
     queries = []
-    if os.path.isdir(path):
-        for file_path in glob.glob(os.path.join(path, "*.sql")):
-            queries.extend(parse_file_queries(file_path))
-    elif os.path.isfile(path):
-        queries.extend(parse_file_queries(path))
-    else:
+    for file_path in _query_files(path):
+        queries.extend(parse_file_queries(file_path))
+    return queries
+
+
+def _catalog_key(path: Path) -> tuple:
+    if os.path.isfile(path):
+        st = os.stat(path)
+        return ((str(path), st.st_mtime_ns, st.st_size),)
+    if not os.path.isdir(path):
         raise ValueError(f"Path {path} is neither a file nor a directory.")
+    with os.scandir(path) as entries:
+        files = [e for e in entries if e.name.endswith(".sql") and e.is_file()]
+    files.sort(key=lambda e: e.name)
+    stats = [(e.path, e.stat()) for e in files]
+    return tuple((p, st.st_mtime_ns, st.st_size) for p, st in stats)
+
+
+def _catalog_path(path: Path) -> Path:
+    if os.path.isdir(path):
+        return path / "__pycache__" / "litequery.catalog"
+    return path.parent / "__pycache__" / f"{path.stem}.litequery.catalog"
+
+
+def load_queries(path: Path) -> list[Query]:
+    # The parsed catalog is cached next to the queries in marshal format (like
+    # .pyc files) and reused as long as no .sql file was added, removed or
+    # modified.
+    path = Path(path)
+    key = _catalog_key(path)
+    catalog_path = _catalog_path(path)
+    try:
+        with open(catalog_path, "rb") as f:
+            version, cached_key, rows = marshal.loads(f.read())
+        if version == CATALOG_VERSION and cached_key == key:
+            ops = OPS_BY_SYMBOL
+            return [Query(n, sql, args, ops[op], d) for n, sql, args, op, d in rows]
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+
+    queries = parse_queries(path)
+    rows = [(q.name, q.sql, q.args, q.op.value, q.directives) for q in queries]
+    try:
+        catalog_path.parent.mkdir(exist_ok=True)
+        tmp_path = catalog_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            marshal.dump((CATALOG_VERSION, key, rows), f)
+        os.replace(tmp_path, catalog_path)
+    except OSError:
+        pass
     return queries
 
 
-def setup(db_path: str | None = None, queries_path: str | None = None):
-    config = get_config(db_path, queries_path) if db_path else get_config()
-    queries = parse_queries(config.queries_path)
-    return Litequery(config, queries)
+def setup(
+    db_path: str | None = None,
+    queries_path: str | None = None,
+    use_async: bool = False,
+    profile: str | None = None,
+    pragmas: dict[str, str | int] | None = None,
+    databases: dict[str, str] | None = None,
+    shards: dict[str, list[str] | str] | None = None,
+    attach: dict[str, str] | None = None,
+    **options,
+):
+    config = get_config(
+        db_path, queries_path, profile, pragmas, databases, shards, attach
+    )
+    queries = load_queries(config.queries_path)
+    lq = Litequery(config, queries, **options)
+    if use_async:
+        from litequery.aio import AsyncLitequery
+
+        return AsyncLitequery(lq)
+    return lq
 
 
 def row_factory(cursor, row):
-    columns = [desc[0] for desc in cursor.description]
-    return Row(columns, row)
+    return Row(get_shape(cursor.description), row)
+
+
+def compile_row_factory(
+    description,
+    converters: Converters,
+    into=None,
+    declared: tuple[str | None, ...] = (),
+):
+    shape = get_shape(description)
+    columns = converters.column_converters(description, declared)
+    if into is not None:
+        # Objects are built from every column, so nothing is left to defer.
+        build = compile_constructor(shape, into)
+        convert_row = converters.convert_row
+        return lambda cursor, row: build(convert_row(row, columns))
+
+    if not columns:
+        return lambda cursor, row: Row(shape, row)
+
+    def factory(cursor, row, Row=Row, Pending=Pending):
+        values = list(row)
+        for i, converter in columns:
+            if values[i] is not None:
+                values[i] = Pending(values[i], converter)
+        return Row(shape, values)
+
+    return factory
+
+
+JSON_LIST_THRESHOLD = 256
+DECLARED_TYPES_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=256)
+def _in_list_names(sql: str) -> frozenset[str]:
+    names = set(re.findall(r"\bin\s*\(\s*:(\w+)\s*\)", sql, re.IGNORECASE))
+    everywhere = PLACEHOLDER.findall(sql)
+    return frozenset(n for n in names if everywhere.count(n) == 1)
+
+
+@lru_cache(maxsize=1024)
+def _expand_sql(sql: str, sizes: tuple[tuple[str, int | None], ...]) -> str:
+    replacements = {}
+    for key, size in sizes:
+        if size is None:
+            # The unary plus drops the column's affinity, so values compare
+            # with the left-hand side exactly like bound parameters do.
+            replacements[key] = f"select +value from json_each(:{key})"
+        else:
+            replacements[key] = ", ".join(f":{key}_{i}" for i in range(size))
+    return PLACEHOLDER.sub(lambda m: replacements.get(m[1], m[0]), sql)
+
+
+ORDER_KEY = re.compile(r"(\w+)(?:\s+(asc|desc))?", re.IGNORECASE)
+
+
+def _parse_order_by(order_by: str | Iterable[str]) -> tuple[tuple[str, bool], ...]:
+    items = order_by.split(",") if isinstance(order_by, str) else order_by
+    keys = []
+    for item in items:
+        match = ORDER_KEY.fullmatch(item.strip())
+        if match is None:
+            raise ValueError(f"Invalid pagination key '{item.strip()}'.")
+        keys.append((match[1], (match[2] or "asc").lower() == "desc"))
+    if not keys:
+        raise ValueError("Pagination needs at least one key to order by.")
+    return tuple(keys)
+
+
+@lru_cache(maxsize=256)
+def _keyset_sql(sql: str, keys: tuple[tuple[str, bool], ...]) -> tuple[str, str]:
+    sql = sql.strip().rstrip(";")
+    order = ", ".join(f"{name} {'desc' if desc else 'asc'}" for name, desc in keys)
+    if len({desc for _, desc in keys}) == 1:
+        # Row values compare lexicographically, which an index can serve.
+        columns = ", ".join(name for name, _ in keys)
+        after = ", ".join(f":_after_{i}" for i in range(len(keys)))
+        seek = f"({columns}) {'<' if keys[0][1] else '>'} ({after})"
+    else:
+        terms = []
+        for i, (name, desc) in enumerate(keys):
+            equal = [f"{n} = :_after_{j}" for j, (n, _) in enumerate(keys[:i])]
+            terms.append(
+                " and ".join([*equal, f"{name} {'<' if desc else '>'} :_after_{i}"])
+            )
+        seek = " or ".join(f"({term})" for term in terms)
+    first = f"select * from ({sql}) order by {order} limit :_page_size"
+    rest = f"select * from ({sql}) where {seek} order by {order} limit :_page_size"
+    return first, rest
+
+
+def _run_now(query: DeferredQuery) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(query())
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _query_converters(query: Query) -> Converters | None:
+    return RAW if query.directives.get("convert") == "off" else None
+
+
+def _is_routed(query: Query) -> bool:
+    return not ROUTING.isdisjoint(query.directives)
+
+
+def _is_json_list(value: list | tuple) -> bool:
+    return all(type(item) in (int, float, str) for item in value)
+
+
+def _copy_cached(result, into=None):
+    # Rows are read-only, but objects built by into() are handed out as copies
+    # so one caller's changes don't show up in another's results.
+    if isinstance(result, Rows):
+        return Rows(map(copy.copy, result)) if into is not None else Rows(result)
+    if into is not None and result is not None:
+        return copy.copy(result)
+    return result
+
+
+def _result_size(op: Op, result) -> tuple[int, int]:
+    values: Iterable[Any]
+    if result is None:
+        return 0, 0
+    if op == Op.MODIFY:
+        return result, 0
+    if op == Op.INSERT_RETURNING:
+        return len(result) if isinstance(result, list) else 1, 0
+    if op == Op.SELECT_VALUE:
+        values = (result,)
+    elif op == Op.SELECT_ONE:
+        values = result._values if isinstance(result, Row) else ()
+    else:
+        values = (v for row in result if isinstance(row, Row) for v in row._values)
+    size = sum(len(v) for v in values if isinstance(v, (str, bytes)))
+    return len(result) if op == Op.SELECT else 1, size
+
+
+def _stream_rows(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[Row]:
+    try:
+        while batch := cursor.fetchmany(batch_size):
+            yield from batch
+    finally:
+        cursor.close()
 
 
 def adapt_datetime(value: datetime):
@@ -159,94 +727,464 @@ def adapt_datetime(value: datetime):
     return value.replace(tzinfo=None).isoformat(sep=" ")
 
 
-def convert_datetime(value: bytes):
-    return datetime.fromisoformat(value.decode())
+class ChildOptions(TypedDict):
+    """Options routed databases and shards share with the Litequery opening them."""
+
+    pool_size: int | None
+    pool_idle_timeout: float
+    group_commit: bool
+    group_commit_delay: float
+    group_commit_size: int
+    cache_data_version: bool
+    converters: dict[str, Converter | str | None] | None
+
+
+class Connection(sqlite3.Connection):
+    converters: Converters = RAW
+    data_version = None
+    readonly = False
+    pragma_generation = 0
+    pragmas: dict[str, str | int] = {}
 
 
 class Litequery:
-    PRAGMAS = [
-        ("journal_mode", "wal"),
-        ("foreign_keys", 1),
-        ("synchronous", "normal"),
-        ("mmap_size", 134217728),  # 128 Mb
-        ("journal_size_limit", 67108864),  # 64 Mb
-        ("cache_size", 2000),
-    ]
+    PRAGMAS = PROFILES["default"]
+    CONVERTERS: dict[str, Converter | str | None] = {"datetime": convert_datetime}
+    # BEGIN IMMEDIATE/EXCLUSIVE is retried with exponential backoff when it
+    # still gets SQLITE_BUSY after the connection's busy timeout.
+    BUSY_RETRIES = 3
+    BUSY_BACKOFF = 0.05
+    # Threads gather() runs queries on, each with its own read connection.
+    GATHER_WORKERS = 8
 
-    def __init__(self, config: Config, queries):
+    def __init__(
+        self,
+        config: Config,
+        queries,
+        pool_size: int | None = None,
+        pool_idle_timeout: float = 60.0,
+        group_commit: bool = False,
+        group_commit_delay: float = 0.0,
+        group_commit_size: int = 256,
+        instrument: bool = False,
+        slow_query_threshold: float | None = None,
+        cache_data_version: bool = False,
+        converters: dict[str, Converter | str | None] | None = None,
+        maintenance: bool = False,
+        maintenance_interval: float = 60.0,
+        checkpoint_threshold: int = 16777216,  # 16 Mb
+    ):
         self.config = config
         self._thread_local = threading.local()
-        self._create_methods(queries)
 
+        base = self.PRAGMAS if config.profile == "default" else PROFILES[config.profile]
+        self._pragmas = merge_pragmas(base, config.pragmas)
+        self._pragma_generation = 0
+        self._pragma_lock = threading.Lock()
+
+        # sqlite3 has no per-connection adapters, parameters are plain values.
         sqlite3.register_adapter(datetime, adapt_datetime)
-        sqlite3.register_converter("datetime", convert_datetime)
+        self.converters = Converters({**self.CONVERTERS, **(converters or {})})
+        # Declared result column types, by statement.
+        self._declared: dict[str, tuple[str | None, ...]] = {}
+
+        self.pool = None
+        if pool_size:
+            self.pool = ConnectionPool(
+                partial(self._create_connection, shared=True),
+                pool_size,
+                pool_idle_timeout,
+                prepare=self._refresh_pragmas,
+            )
+
+        self._batcher = None
+        if group_commit:
+            self._batcher = WriteBatcher(self, group_commit_delay, group_commit_size)
+
+        self.instrumentation = None
+        if instrument or slow_query_threshold is not None:
+            self.instrumentation = Instrumentation(slow_query_threshold)
+
+        self.cache = None
+        self._cache_data_version = cache_data_version
+        for query in queries:
+            if query.directives.get("convert", "on") not in ("on", "off"):
+                raise ValueError(
+                    f"Query '{query.name}' has an invalid convert directive, "
+                    "expected 'on' or 'off'."
+                )
+            # Routed queries are cached by the database they run on.
+            if "cache" in query.directives and not _is_routed(query):
+                if query.op not in READ_OPS:
+                    raise ValueError(f"Query '{query.name}' can't be cached.")
+                if self.cache is None:
+                    self.cache = ResultCache()
+                policy = CachePolicy.parse(query.directives["cache"])
+                self.cache.register(query.name, query.sql, policy)
+
+        self.maintenance = None
+        if maintenance:
+            self.maintenance = Maintenance(
+                config.database_path,
+                self._create_connection,
+                maintenance_interval,
+                checkpoint_threshold,
+            )
+
+        self._child_options: ChildOptions = {
+            "pool_size": pool_size,
+            "pool_idle_timeout": pool_idle_timeout,
+            "group_commit": group_commit,
+            "group_commit_delay": group_commit_delay,
+            "group_commit_size": group_commit_size,
+            "cache_data_version": cache_data_version,
+            "converters": converters,
+        }
+        self.databases: dict[str, Litequery] = {}
+        self.shards: dict[str, HashShards | TimeShards] = {}
+        self._setup_routing(queries)
+
+        self._gather_executor: ThreadPoolExecutor | None = None
+        self._gather_connections: list[Connection] = []
+        self._gather_lock = threading.Lock()
+
+        # Registered last, so every attribute above is a reserved name.
+        self._register_queries(queries)
+        if self.maintenance is not None:
+            self.maintenance.start()
+
+    def _create_connection(
+        self, readonly: bool = False, shared: bool = False
+    ) -> Connection:
+        database: Path | str = self.config.database_path
+        if readonly:
+            database = f"{self.config.database_path.as_uri()}?mode=ro"
 
-    def _create_connection(self) -> sqlite3.Connection:
         conn = sqlite3.connect(
-            self.config.database_path,
+            database,
+            factory=Connection,
             timeout=30,
             autocommit=True,
-            detect_types=sqlite3.PARSE_COLNAMES | sqlite3.PARSE_DECLTYPES,
+            check_same_thread=not shared,
+            uri=readonly,
         )
         conn.row_factory = row_factory
-        pragmas = (f"PRAGMA {p} = {v}" for p, v in self.PRAGMAS)
-        conn.executescript(";".join(pragmas))
+        conn.converters = self.converters
+        conn.readonly = readonly
+        with self._pragma_lock:
+            generation, pragmas = self._pragma_generation, self._pragmas
+        self._apply_pragmas(conn, pragmas)
+        conn.pragma_generation = generation
+        for name, path in self.config.attach.items():
+            target = f"{path.as_uri()}?mode=ro" if readonly else str(path)
+            conn.execute(f"ATTACH DATABASE ? AS {name}", (target,))
         return conn
 
-    def _get_connection(self) -> sqlite3.Connection:
-        if not hasattr(self._thread_local, "conn"):
-            self._thread_local.conn = self._create_connection()
-        return self._thread_local.conn
+    def _apply_pragmas(self, conn: Connection, pragmas: list[tuple[str, str | int]]):
+        applied = dict(conn.pragmas)
+        changes = [(p, v) for p, v in pragmas if applied.get(p, MISSING) != v]
+        applied.update(changes)
+        if conn.readonly:
+            changes = [(p, v) for p, v in changes if p not in WRITER_ONLY]
+            changes.append(("query_only", 1))
+        if changes:
+            conn.executescript(pragma_statements(changes))
+        conn.pragmas = applied
+
+    def _refresh_pragmas(self, conn: Connection):
+        if conn.pragma_generation != self._pragma_generation:
+            with self._pragma_lock:
+                generation, pragmas = self._pragma_generation, self._pragmas
+            self._apply_pragmas(conn, pragmas)
+            conn.pragma_generation = generation
+
+    def set_pragmas(self, **pragmas: str | int):
+        pragma_statements(list(pragmas.items()))
+        with self._pragma_lock:
+            self._pragmas = merge_pragmas(self._pragmas, pragmas)
+            self._pragma_generation += 1
+        # Other connections pick the change up the next time they're used.
+        with self._connection() as conn:
+            self._refresh_pragmas(conn)
 
-    def _create_methods(self, queries: list[Query]):
+    def pragmas(self) -> dict[str, Any]:
+        # Pooled readers skip the writer-only pragmas, the writer has them all.
+        with self._connection(write=True) as conn:
+            return {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                for name, _ in self._pragmas
+            }
+
+    @contextmanager
+    def bulk_load(self, **pragmas: str | int):
+        settings = merge_pragmas(BULK_LOAD_PRAGMAS, pragmas)
+        with self._connection() as conn:
+            if conn.in_transaction:
+                raise RuntimeError("bulk_load() can't start inside a transaction.")
+            # Leaving WAL needs every other connection closed, which pooled
+            # readers and the maintenance thread aren't, so WAL stays on.
+            wal = conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            if wal and "journal_mode" not in pragmas:
+                settings = [(n, v) for n, v in settings if n != "journal_mode"]
+            previous = [
+                (name, conn.execute(f"PRAGMA {name}").fetchone()[0])
+                for name, _ in settings
+            ]
+            conn.executescript(pragma_statements(settings))
+            try:
+                yield
+            finally:
+                conn.executescript(pragma_statements(previous))
+
+    def _get_connection(self) -> Connection:
+        conn = getattr(self._thread_local, "conn", None)
+        if conn is None:
+            conn = self._thread_local.conn = self._create_connection()
+        elif conn.pragma_generation != self._pragma_generation:
+            self._refresh_pragmas(conn)
+        return conn
+
+    @contextmanager
+    def _connection(self, write: bool = True) -> Iterator[Connection]:
+        if self.pool is None:
+            yield self._get_connection()
+        else:
+            with self.pool.connection(write) as conn:
+                yield conn
+
+    def _register_queries(self, queries: list[Query]):
+        self._queries: dict[str, Query] = {}
+        reserved = {*dir(Litequery), *vars(self)}
         for query in queries:
-            if hasattr(self, query.name):
-                if hasattr(Litequery, query.name):
-                    raise NameError(f"Query name {query.name} isn't allowed.")
-
-                if callable(getattr(self, query.name)):
-                    raise NameError(
-                        f"Duplicate query name '{query.name}'. "
-                        "Each query must have a unique name."
-                    )
-            setattr(self, query.name, self._create_method(query))
+            if query.name in reserved:
+                raise NameError(f"Query name {query.name} isn't allowed.")
+
+            if query.name in self._queries:
+                raise NameError(
+                    f"Duplicate query name '{query.name}'. "
+                    "Each query must have a unique name."
+                )
+            self._queries[query.name] = query
+
+    def __getattr__(self, name: str):
+        # Query methods are only built the first time they're looked up.
+        query = self.__dict__.get("_queries", {}).get(name)
+        if query is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        method = self._create_method(query)
+        setattr(self, name, method)
+        return method
 
     def _expand_parameters(self, sql: str, parameters: dict):
         if not any(isinstance(v, (list, tuple)) for v in parameters.values()):
             return sql, parameters
 
-        expanded_sql = sql
+        sizes: list[tuple[str, int | None]] = []
         expanded_parameters = {}
+        in_lists = _in_list_names(sql)
 
         for key, value in parameters.items():
-            if isinstance(value, (list, tuple)):
-                if len(value) == 0:
-                    raise ValueError(
-                        f"Parameter '{key}' is an empty {type(value).__name__}. "
-                        "At least one value is required."
-                    )
-                placeholders = ", ".join(f":{key}_{i}" for i in range(len(value)))
-                expanded_sql = expanded_sql.replace(f":{key}", placeholders)
-                for i, item in enumerate(value):
-                    expanded_parameters[f"{key}_{i}"] = item
-            else:
+            if not isinstance(value, (list, tuple)):
                 expanded_parameters[key] = value
+                continue
+            if len(value) == 0:
+                raise ValueError(
+                    f"Parameter '{key}' is an empty {type(value).__name__}. "
+                    "At least one value is required."
+                )
 
-        return expanded_sql, expanded_parameters
+            if key not in in_lists:
+                size = len(value)
+            elif len(value) > JSON_LIST_THRESHOLD and _is_json_list(value):
+                sizes.append((key, None))
+                expanded_parameters[key] = json.dumps(value)
+                continue
+            else:
+                # Duplicates don't change the result of IN, so padding to a
+                # power of two keeps the number of distinct statements small.
+                size = 1 << (len(value) - 1).bit_length()
 
-    def _execute_query(
-        self,
-        sql: str,
-        op: Op,
-        parameters: dict | None = None,
-    ):
+            sizes.append((key, size))
+            for i in range(size):
+                expanded_parameters[f"{key}_{i}"] = value[min(i, len(value) - 1)]
+
+        return _expand_sql(sql, tuple(sizes)), expanded_parameters
+
+    def _execute_query(self, query: Query, parameters: dict | None = None, into=None):
         if not parameters:
             parameters = {}
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self._run_query(query, parameters, into)
+        return self._execute_instrumented(instrumentation, query, parameters, into)
+
+    def _run_query(self, query: Query, parameters: dict, into=None):
+        if self.cache is not None:
+            return self._run_cached(self.cache, query, parameters, into)
+        return self._perform(query, parameters, into)
+
+    def _run_cached(
+        self, cache: ResultCache, query: Query, parameters: dict, into=None
+    ):
+        # raw() runs any statement as a read, so only a plain SELECT counts.
+        writes = query.name in RAW_QUERIES and not reads_only(query.sql)
+        if query.op in WRITE_OPS or writes:
+            try:
+                return self._perform(query, parameters, into)
+            finally:
+                self._invalidate_cache(query.sql)
+
+        key = cache_key(parameters, into)
+        if not cache.caches(query.name) or key is None or self._in_transaction():
+            return self._perform(query, parameters, into)
+
+        if self._cache_data_version:
+            self._check_data_version()
+        result, generation = cache.get(query.name, key)
+        if result is MISSING:
+            result = self._perform(query, parameters, into)
+            cache.put(query.name, key, result, generation)
+        return _copy_cached(result, into)
+
+    def _invalidate_cache(self, sql: str):
+        self._invalidate_tables(written_tables(sql))
+
+    def _invalidate_tables(self, tables: frozenset[str]):
+        if self.cache is None:
+            return
+        self.cache.invalidate(tables)
+        if self._in_transaction():
+            # Other threads may cache pre-commit state until this transaction
+            # ends, so the tables are invalidated once more at that point.
+            self._thread_local.dirty_tables = (
+                getattr(self._thread_local, "dirty_tables", frozenset()) | tables
+            )
+
+    def _check_data_version(self):
+        with self._connection(write=False) as conn:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if conn.data_version != version:
+                # Another connection committed since this one last looked, and
+                # it may have been another process, so nothing can be trusted.
+                conn.data_version = version
+                self.cache.clear()
+
+    def _perform(self, query: Query, parameters: dict, into=None):
+        sql, parameters = self._expand_parameters(query.sql, parameters)
+        op = query.op
+
+        if self._batcher is not None and op in WRITE_OPS:
+            if not self._in_transaction():
+                return self._batcher.submit(sql, op, parameters).result()
+
+        converters = _query_converters(query)
+        if self.pool is None:
+            conn = self._get_connection()
+            return self._fetch(conn, sql, op, parameters, into, converters)
+        with self.pool.connection(op not in READ_OPS) as conn:
+            return self._fetch(conn, sql, op, parameters, into, converters)
 
-        sql, parameters = self._expand_parameters(sql, parameters)
+    def _execute_instrumented(
+        self,
+        instrumentation: Instrumentation,
+        query: Query,
+        parameters: dict,
+        into=None,
+    ):
+        run = partial(self._run_query, query, parameters, into)
+        return self._instrumented(instrumentation, query, parameters, run)
 
-        conn = self._get_connection()
+    def _instrumented(
+        self,
+        instrumentation: Instrumentation,
+        query: Query,
+        parameters: dict,
+        run: Callable,
+    ):
+        result = error = None
+        started = time.perf_counter()
+        try:
+            result = run()
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            rows, size = _result_size(query.op, result)
+            event = QueryEvent(
+                name=query.name,
+                sql=query.sql,
+                parameters=parameters_shape(parameters),
+                duration=duration,
+                rows=rows,
+                bytes=size,
+                error=error,
+            )
+            instrumentation.record(event)
+            if error is None and instrumentation.is_slow(duration):
+                instrumentation.log_slow_query(event, self._plan(query, parameters))
+
+    def _plan(self, query: Query, parameters: dict) -> list[str]:
+        sql, parameters = self._expand_parameters(query.sql, parameters)
+        try:
+            with self._connection(query.op not in READ_OPS) as conn:
+                cursor = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+                cursor.row_factory = None
+                return [detail for _, _, _, detail in cursor.fetchall()]
+        except sqlite3.Error:
+            return []
+
+    def _in_transaction(self) -> bool:
+        if self.pool is None:
+            return self._get_connection().in_transaction
+        return self.pool.owns_writer() or self.pool.pins_reader()
+
+    def _submit_write(self, batcher: WriteBatcher, query: Query, parameters: dict):
+        sql, parameters = self._expand_parameters(query.sql, parameters)
+        return batcher.submit(sql, query.op, parameters)
+
+    def _execute(
+        self,
+        conn: Connection,
+        sql: str,
+        parameters: dict,
+        into=None,
+        converters: Converters | None = None,
+    ):
+        converters = converters or conn.converters
+        declared = self._declared_types(conn, sql, converters)
         cursor = conn.execute(sql, parameters)
+        if cursor.description:
+            cursor.row_factory = compile_row_factory(
+                cursor.description, converters, into, declared
+            )
+        return cursor
+
+    def _declared_types(
+        self, conn: Connection, sql: str, converters: Converters
+    ) -> tuple[str | None, ...]:
+        if not converters.converters:
+            return ()
+        declared = self._declared.get(sql)
+        if declared is None:
+            if len(self._declared) >= DECLARED_TYPES_CACHE_SIZE:
+                self._declared.clear()
+            declared = self._declared[sql] = declared_types(conn, sql)
+        return declared
+
+    def _fetch(
+        self,
+        conn: Connection,
+        sql: str,
+        op: Op,
+        parameters: dict,
+        into=None,
+        converters: Converters | None = None,
+    ):
+        cursor = self._execute(conn, sql, parameters, into, converters)
 
         if op == Op.SELECT:
             return Rows(cursor.fetchall())
@@ -260,38 +1198,496 @@ class Litequery:
         if op == Op.INSERT_RETURNING:
             return cursor.lastrowid
 
-    def _create_method(self, query: Query):
-        def query_method(**parameters):
-            return self._execute_query(query.sql, query.op, parameters)
+    def _iter_query(self, query: Query, parameters: dict, batch_size: int):
+        sql, parameters = self._expand_parameters(query.sql, parameters)
+
+        converters = _query_converters(query)
+        if self.pool is None:
+            conn = self._get_connection()
+            cursor = self._execute(conn, sql, parameters, converters=converters)
+            return _stream_rows(cursor, batch_size)
+        return self._stream_pooled(self.pool, sql, parameters, batch_size, converters)
+
+    def _stream_pooled(
+        self,
+        pool: ConnectionPool,
+        sql: str,
+        parameters: dict,
+        batch_size: int,
+        converters=None,
+    ):
+        # The reader is only taken once iteration starts and goes back to the
+        # pool when the iterator is exhausted or closed.
+        with pool.connection(write=False) as conn:
+            cursor = self._execute(conn, sql, parameters, converters=converters)
+            yield from _stream_rows(cursor, batch_size)
+
+    def _paginate(
+        self,
+        query: Query,
+        order_by: str | Iterable[str],
+        page_size: int,
+        parameters: dict,
+    ):
+        keys = _parse_order_by(order_by)
+        first, rest = _keyset_sql(query.sql, keys)
+        name = f"{query.name}.paginate"
+        page_query = Query(name, first, query.args, Op.SELECT, query.directives)
+        next_query = Query(name, rest, query.args, Op.SELECT, query.directives)
+        parameters = {**parameters, "_page_size": page_size}
+        while True:
+            page = self._execute_query(page_query, parameters)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
 
-        return query_method
+            last = page[-1]
+            for i, (key, _) in enumerate(keys):
+                if last[key] is None:
+                    raise ValueError(f"Can't paginate past a NULL '{key}'.")
+                parameters[f"_after_{i}"] = last[key]
+            page_query = next_query
+
+    def _columnar_query(self, query: Query, parameters: dict, batch_size: int):
+        sql, parameters = self._expand_parameters(query.sql, parameters)
+        with self._connection(write=False) as conn:
+            converters = _query_converters(query) or conn.converters
+            declared = self._declared_types(conn, sql, converters)
+            cursor = conn.execute(sql, parameters)
+            typed = converters.column_converters(cursor.description or (), declared)
+            columns = fetch_columns(cursor, batch_size)
+        names = list(columns)
+        for i, converter in typed:
+            columns[names[i]] = converters.convert_column(columns[names[i]], converter)
+        return columns
+
+    def _execute_many(
+        self,
+        query: Query,
+        parameters: Iterable[dict],
+        chunk_size: int,
+    ):
+        try:
+            return self._perform_many(query, parameters, chunk_size)
+        finally:
+            if self.cache is not None:
+                self._invalidate_cache(query.sql)
+
+    def _perform_many(
+        self,
+        query: Query,
+        parameters: Iterable[dict],
+        chunk_size: int,
+    ):
+        rows = iter(parameters)
+        ids, rowcount = [], 0
+        with (
+            self._connection() as conn,
+            nullcontext() if conn.in_transaction else self.transaction(),
+        ):
+            for first in rows:
+                chunk = [first, *islice(rows, chunk_size - 1)]
+                run = partial(self._run_chunk, conn, query, chunk)
+                # Each chunk is recorded as one event, shaped like its first row.
+                if self.instrumentation is not None:
+                    result = self._instrumented(self.instrumentation, query, first, run)
+                else:
+                    result = run()
+                if query.op == Op.INSERT_RETURNING:
+                    ids += result
+                else:
+                    rowcount += result
+        return ids if query.op == Op.INSERT_RETURNING else rowcount
+
+    def _run_chunk(self, conn: Connection, query: Query, chunk: list[dict]):
+        expanded = [self._expand_parameters(query.sql, row) for row in chunk]
+        if query.op == Op.INSERT_RETURNING:
+            # executemany() can't return rows, but every execute() reuses
+            # the prepared statement and shares the same transaction.
+            return [conn.execute(sql, row).lastrowid for sql, row in expanded]
+
+        # Lists of different lengths expand to different statements.
+        rowcount = 0
+        for sql, group in groupby(expanded, key=itemgetter(0)):
+            rowcount += conn.executemany(sql, [row for _, row in group]).rowcount
+        return rowcount
+
+    def _setup_routing(self, queries: list[Query]):
+        routed = defaultdict(list)
+        sharded = defaultdict(list)
+        for query in queries:
+            database = query.directives.get("database")
+            shard = query.directives.get("shard")
+            if database is not None and shard is not None:
+                raise ValueError(
+                    f"Query '{query.name}' can't use both a database and a shard."
+                )
+            if database is not None:
+                if database not in self.config.databases:
+                    raise ValueError(
+                        f"Query '{query.name}' uses unknown database '{database}'."
+                    )
+                routed[database].append(query)
+            elif shard is not None:
+                group, key = parse_shard_directive(shard)
+                if group not in self.config.shards:
+                    raise ValueError(
+                        f"Query '{query.name}' uses unknown shard group '{group}'."
+                    )
+                # Row reads without the key always run on every shard.
+                if key not in query.args and query.op not in (Op.SELECT, Op.SELECT_ONE):
+                    raise ValueError(
+                        f"Shard key ':{key}' isn't a parameter of '{query.name}'."
+                    )
+                sharded[group].append(query)
+
+        for name, path in self.config.databases.items():
+            self.databases[name] = self._open_child(path, routed[name])
+        for name, spec in self.config.shards.items():
+            open_shard = partial(self._open_child, queries=sharded[name])
+            if isinstance(spec, Path):
+                self.shards[name] = TimeShards(spec, open_shard)
+            else:
+                self.shards[name] = HashShards(spec, open_shard)
+
+    def _open_child(self, database_path: Path, queries: list[Query]) -> "Litequery":
+        database_path.parent.mkdir(parents=True, exist_ok=True)
+        config = replace(
+            self.config, database_path=database_path, databases={}, shards={}
+        )
+        queries = [
+            replace(
+                q,
+                directives={k: v for k, v in q.directives.items() if k not in ROUTING},
+            )
+            for q in queries
+        ]
+        child = Litequery(config, queries, **self._child_options)
+        child.instrumentation = self.instrumentation
+        return child
+
+    def _create_method(self, query: Query):
+        database = query.directives.get("database")
+        if database is not None and self.databases:
+            return RoutedQueryMethod(self.databases[database], query, self)
+        shard = query.directives.get("shard")
+        if shard is not None and self.shards:
+            group, key = parse_shard_directive(shard)
+            return ShardedQueryMethod(self.shards[group], query, key, self)
+        return QueryMethod(self, query)
 
     def raw(self, sql: str, **parameters):
-        return self._execute_query(sql, Op.SELECT, parameters)
+        return self._execute_query(Query("raw", sql, [], Op.SELECT), parameters)
 
     def raw_one(self, sql: str, **parameters):
-        return self._execute_query(sql, Op.SELECT_ONE, parameters)
+        query = Query("raw_one", sql, [], Op.SELECT_ONE)
+        return self._execute_query(query, parameters)
 
     def raw_value(self, sql: str, **parameters):
-        return self._execute_query(sql, Op.SELECT_VALUE, parameters)
+        query = Query("raw_value", sql, [], Op.SELECT_VALUE)
+        return self._execute_query(query, parameters)
+
+    def raw_iter(self, sql: str, batch_size: int = 1000, **parameters):
+        query = Query("raw_iter", sql, [], Op.SELECT)
+        return self._iter_query(query, parameters, batch_size)
+
+    def raw_columnar(self, sql: str, batch_size: int = 10_000, **parameters):
+        query = Query("raw_columnar", sql, [], Op.SELECT)
+        return self._columnar_query(query, parameters, batch_size)
 
     @contextmanager
-    def transaction(self):
-        conn = self._get_connection()
-        if conn.in_transaction:
-            raise RuntimeError("Nested transactions are not supported")
+    def transaction(self, mode: str = "immediate"):
+        mode = mode.upper()
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(f"Unknown transaction mode '{mode}'.")
+
+        with self._connection() as conn:
+            if conn.in_transaction:
+                with self._savepoint(conn):
+                    yield
+                return
+
+            conn.autocommit = sqlite3.LEGACY_TRANSACTION_CONTROL
+            try:
+                self._begin(conn, mode)
+                yield
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+                self._flush_dirty_tables()
+
+    @contextmanager
+    def read_snapshot(self):
+        if self.pool is None or self.pool.owns_writer():
+            connection = self._connection(write=False)
+        else:
+            connection = self.pool.pinned_reader()
+
+        with connection as conn:
+            if conn.in_transaction:
+                yield
+                return
+
+            conn.autocommit = sqlite3.LEGACY_TRANSACTION_CONTROL
+            try:
+                conn.execute("BEGIN DEFERRED")
+                # A deferred transaction only takes its snapshot on first read.
+                conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+                yield
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+                self._flush_dirty_tables()
 
-        conn.autocommit = sqlite3.LEGACY_TRANSACTION_CONTROL
+    def _begin(self, conn: sqlite3.Connection, mode: str):
+        delay = self.BUSY_BACKOFF
+        for attempt in range(self.BUSY_RETRIES + 1):
+            try:
+                conn.execute(f"BEGIN {mode}")
+                return
+            except sqlite3.OperationalError as e:
+                busy = e.sqlite_errorcode & 0xFF == sqlite3.SQLITE_BUSY
+                if not busy or mode == "DEFERRED" or attempt == self.BUSY_RETRIES:
+                    raise
+            time.sleep(delay * (1 + random.random()))
+            delay *= 2
+
+    @contextmanager
+    def _savepoint(self, conn: sqlite3.Connection):
+        depth = getattr(self._thread_local, "savepoints", 0)
+        name = f"litequery_{depth}"
+        conn.execute(f"SAVEPOINT {name}")
+        self._thread_local.savepoints = depth + 1
         try:
-            conn.execute("BEGIN IMMEDIATE")
             yield
-        except Exception:
-            conn.rollback()
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute(f"ROLLBACK TO {name}")
+                conn.execute(f"RELEASE {name}")
             raise
+        else:
+            conn.execute(f"RELEASE {name}")
+        finally:
+            self._thread_local.savepoints = depth
+
+    def _flush_dirty_tables(self):
+        dirty = getattr(self._thread_local, "dirty_tables", None)
+        if dirty:
+            self.cache.invalidate(dirty)
+            del self._thread_local.dirty_tables
+
+    def connect(self) -> None:
+        if self.pool is None:
+            self._get_connection()
+
+    def maintain(
+        self,
+        checkpoint_mode: str | None = "passive",
+        analyze: bool = True,
+        vacuum_pages: int | None = 0,
+    ) -> MaintenanceReport:
+        with self._connection() as conn:
+            return run_maintenance(
+                conn, self.config.database_path, checkpoint_mode, analyze, vacuum_pages
+            )
+
+    def explain_all(self) -> list[QueryPlan]:
+        """Plans of every query, routed ones explained on their own database."""
+        plans = {}
+        targets = defaultdict(list)
+        for query in self._queries.values():
+            target = self._plan_target(query)
+            if target is None:
+                plans[query.name] = QueryPlan(query.name, skipped="no shard exists yet")
+            else:
+                targets[target].append(query)
+        for target, queries in targets.items():
+            with target._connection(write=False) as conn:
+                plans.update((p.name, p) for p in explain_queries(conn, queries))
+        return [plans[name] for name in self._queries]
+
+    def _plan_target(self, query: Query) -> "Litequery | None":
+        database = query.directives.get("database")
+        if database is not None:
+            return self.databases[database]
+        shard = query.directives.get("shard")
+        if shard is not None:
+            group, _ = parse_shard_directive(shard)
+            # Shards share a schema, so the first one stands for all of them.
+            return next(iter(self.shards[group].all()), None)
+        return self
+
+    @contextmanager
+    def blob(
+        self, table: str, column: str, row: int, readonly: bool = True
+    ) -> Iterator[sqlite3.Blob]:
+        with self._connection(write=not readonly) as conn:
+            blob = conn.blobopen(table, column, row, readonly=readonly)
+            try:
+                yield blob
+            finally:
+                blob.close()
+                if not readonly and self.cache is not None:
+                    self._invalidate_tables(frozenset({table.lower()}))
+
+    def read_blob(
+        self,
+        table: str,
+        column: str,
+        row: int,
+        out: IO[bytes],
+        chunk_size: int = CHUNK_SIZE,
+    ) -> int:
+        with self.blob(table, column, row) as blob:
+            return copy_to(blob, out, chunk_size)
+
+    def read_blob_into(
+        self, table: str, column: str, row: int, buffer, offset: int = 0
+    ) -> memoryview:
+        with self.blob(table, column, row) as blob:
+            return read_into(blob, buffer, offset)
+
+    def iter_blob(
+        self, table: str, column: str, row: int, chunk_size: int = CHUNK_SIZE
+    ) -> Generator[bytes, None, None]:
+        with self.blob(table, column, row) as blob:
+            yield from iter_chunks(blob, chunk_size)
+
+    def write_blob(
+        self,
+        table: str,
+        column: str,
+        row: int,
+        source: IO[bytes],
+        size: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> int:
+        if size is None:
+            size = source_size(source)
+        sql = (
+            f"update {quote_identifier(table)} set {quote_identifier(column)} = "
+            "zeroblob(:size) where rowid = :row"
+        )
+        # The column is sized once with zeroblob, then filled in place, so the
+        # whole value never has to be held in memory.
+        with self.transaction():
+            query = Query("write_blob", sql, ["size", "row"], Op.MODIFY)
+            if not self._execute_query(query, {"size": size, "row": row}):
+                raise ValueError(f"No row {row} in table '{table}'.")
+            with self.blob(table, column, row, readonly=False) as blob:
+                return copy_from(blob, source, chunk_size)
+
+    def backup(
+        self,
+        target: str | Path,
+        pages_per_step: int = 1024,
+        sleep: float = 0.0,
+        progress: Progress | None = None,
+        vacuum: bool = False,
+    ) -> Path:
+        # A connection of its own keeps the long read transaction away from
+        # the ones serving queries.
+        conn = self._create_connection()
+        try:
+            return run_backup(conn, target, pages_per_step, sleep, progress, vacuum)
         finally:
-            conn.autocommit = True
+            conn.close()
+
+    @property
+    def q(self) -> DeferredQueries:
+        return DeferredQueries(self)
+
+    def gather(self, *queries: DeferredQuery, return_exceptions: bool = False) -> list:
+        """Run independent read queries concurrently, results in argument order.
+
+        With `return_exceptions`, a failed query's exception takes its place in
+        the results instead of being raised.
+        """
+        if self._in_transaction():
+            # Other connections wouldn't see this transaction's writes.
+            futures = [_run_now(query) for query in queries]
+        else:
+            executor = self._gather_pool()
+            # Without a pool, routed databases would open connections on the
+            # gather threads that nothing closes, so they run on this thread.
+            local = self.pool is None
+            submitted = {
+                i: executor.submit(query)
+                for i, query in enumerate(queries)
+                if not (local and isinstance(query.method, RoutedQueryMethod))
+            }
+            futures = [
+                submitted[i] if i in submitted else _run_now(query)
+                for i, query in enumerate(queries)
+            ]
+
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            elif return_exceptions:
+                results.append(error)
+            else:
+                for pending in futures:
+                    pending.cancel()
+                raise error
+        return results
+
+    def _gather_pool(self) -> ThreadPoolExecutor:
+        with self._gather_lock:
+            if self._gather_executor is None:
+                self._gather_executor = ThreadPoolExecutor(
+                    self.GATHER_WORKERS,
+                    "litequery-gather",
+                    # Pooled readers already give each thread its own connection.
+                    initializer=self._open_gather_connection
+                    if self.pool is None
+                    else None,
+                )
+            return self._gather_executor
+
+    def _open_gather_connection(self):
+        conn = self._create_connection(readonly=True, shared=True)
+        self._thread_local.conn = conn
+        with self._gather_lock:
+            self._gather_connections.append(conn)
 
     def close(self) -> None:
+        for child in (*self.databases.values(), *self.shards.values()):
+            child.close()
+        if self._gather_executor is not None:
+            self._gather_executor.shutdown()
+            self._gather_executor = None
+            for conn in self._gather_connections:
+                conn.close()
+            self._gather_connections.clear()
+        if self._batcher is not None:
+            self._batcher.close()
+        if self.maintenance is not None:
+            self.maintenance.close()
+        if self.pool is not None:
+            if self.maintenance is not None:
+                with self.pool.writer() as conn:
+                    self._optimize_on_close(conn)
+            self.pool.close()
+        else:
+            self._close_thread_connection()
+
+    def _close_thread_connection(self) -> None:
         if hasattr(self._thread_local, "conn"):
+            if self.maintenance is not None:
+                self._optimize_on_close(self._thread_local.conn)
             self._thread_local.conn.close()
             del self._thread_local.conn
+
+    def _optimize_on_close(self, conn: sqlite3.Connection):
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass  # Read-only database or a locked one, try again next time.
@@ -0,0 +1,115 @@
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+logger = logging.getLogger("litequery")
+
+# Upper bounds in seconds, the last bucket catches everything slower.
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+@dataclass
+class QueryEvent:
+    name: str
+    sql: str
+    parameters: dict[str, str]
+    duration: float
+    rows: int
+    bytes: int
+    error: BaseException | None = None
+
+
+@dataclass
+class QueryStats:
+    name: str
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    histogram: list[int] = field(default_factory=lambda: [0] * 10)
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class Instrumentation:
+    def __init__(
+        self,
+        slow_query_threshold: float | None = None,
+        callbacks: list[Callable[[QueryEvent], Any]] | None = None,
+    ):
+        self.slow_query_threshold = slow_query_threshold
+        self._callbacks = list(callbacks or [])
+        self._stats: dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[QueryEvent], Any]):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[QueryEvent], Any]):
+        self._callbacks.remove(callback)
+
+    def is_slow(self, duration: float) -> bool:
+        threshold = self.slow_query_threshold
+        return threshold is not None and duration >= threshold
+
+    def record(self, event: QueryEvent):
+        bucket = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if event.duration <= bound:
+                bucket = i
+                break
+
+        with self._lock:
+            stats = self._stats.get(event.name)
+            if stats is None:
+                stats = self._stats[event.name] = QueryStats(event.name)
+            stats.calls += 1
+            stats.errors += event.error is not None
+            stats.total_time += event.duration
+            stats.max_time = max(stats.max_time, event.duration)
+            stats.rows += event.rows
+            stats.bytes += event.bytes
+            stats.histogram[bucket] += 1
+
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Query instrumentation callback failed")
+
+    def log_slow_query(self, event: QueryEvent, plan: list[str]):
+        logger.warning(
+            "Slow query %s took %.1f ms\n%s\nparameters: %s\nplan:\n%s",
+            event.name,
+            event.duration * 1000,
+            event.sql.strip(),
+            event.parameters,
+            "\n".join(plan) or "(unavailable)",
+        )
+
+    def snapshot(self) -> dict[str, QueryStats]:
+        with self._lock:
+            return {
+                name: replace(stats, histogram=list(stats.histogram))
+                for name, stats in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def parameters_shape(parameters: dict) -> dict[str, str]:
+    shape = {}
+    for key, value in parameters.items():
+        if isinstance(value, (list, tuple)):
+            shape[key] = f"{type(value).__name__}[{len(value)}]"
+        else:
+            shape[key] = type(value).__name__
+    return shape
@@ -0,0 +1,162 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger("litequery")
+
+CHECKPOINT_MODES = frozenset({"PASSIVE", "FULL", "RESTART", "TRUNCATE"})
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class MaintenanceReport:
+    wal_size: int = 0
+    # (busy, WAL frames, frames checkpointed) as returned by wal_checkpoint.
+    checkpoint: tuple[int, int, int] | None = None
+    optimized: bool = False
+    vacuumed_pages: int = 0
+
+
+def wal_size(database_path: Path) -> int:
+    try:
+        return os.path.getsize(f"{database_path}-wal")
+    except OSError:
+        return 0
+
+
+def checkpoint(conn: sqlite3.Connection, mode: str = "passive"):
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode '{mode}'.")
+    busy, frames, checkpointed = conn.execute(
+        f"PRAGMA wal_checkpoint({mode})"
+    ).fetchone()
+    return busy, frames, checkpointed
+
+
+def optimize(conn: sqlite3.Connection, analysis_limit: int = 400):
+    previous = conn.execute("PRAGMA analysis_limit").fetchone()[0]
+    conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+    try:
+        # 0x10002 checks every table, not only those this connection has queried.
+        _drain(conn.execute("PRAGMA optimize = 0x10002"))
+    finally:
+        conn.execute(f"PRAGMA analysis_limit = {int(previous)}")
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int | None = None) -> int:
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        return 0
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if not before:
+        return 0
+    limit = f"({int(pages)})" if pages else ""
+    _drain(conn.execute(f"PRAGMA incremental_vacuum{limit}"))
+    return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def _drain(cursor: sqlite3.Cursor):
+    # Both pragmas do their work one step at a time and return no columns.
+    cursor.row_factory = None
+    cursor.fetchall()
+
+
+def maintain(
+    conn: sqlite3.Connection,
+    database_path: Path,
+    checkpoint_mode: str | None = "passive",
+    analyze: bool = True,
+    vacuum_pages: int | None = 0,
+) -> MaintenanceReport:
+    """Run one round of maintenance on `conn`.
+
+    `vacuum_pages` of None frees every page on the freelist, 0 skips the
+    incremental vacuum.
+    """
+    report = MaintenanceReport(wal_size=wal_size(database_path))
+    if checkpoint_mode is not None and report.wal_size:
+        report.checkpoint = checkpoint(conn, checkpoint_mode)
+    if analyze:
+        optimize(conn)
+        report.optimized = True
+    if vacuum_pages != 0:
+        report.vacuumed_pages = incremental_vacuum(conn, vacuum_pages)
+    return report
+
+
+class Maintenance:
+    """Background thread that keeps the WAL and planner statistics in shape.
+
+    Every `interval` seconds the WAL is checkpointed: passively, or with
+    TRUNCATE once it grew past `checkpoint_threshold` bytes. `PRAGMA optimize`
+    runs every `optimize_interval` seconds, and an incremental vacuum frees up
+    to `vacuum_pages` pages when nothing was committed since the previous
+    round. The thread uses its own connection without a busy timeout, so it
+    skips a round rather than making foreground queries wait.
+    """
+
+    def __init__(
+        self,
+        database_path: Path,
+        connect: Callable[[], sqlite3.Connection],
+        interval: float = 60.0,
+        checkpoint_threshold: int = 16777216,  # 16 Mb
+        optimize_interval: float = 3600.0,
+        vacuum_pages: int = 256,
+    ):
+        self._database_path = database_path
+        self._connect = connect
+        self.interval = interval
+        self.checkpoint_threshold = checkpoint_threshold
+        self.optimize_interval = optimize_interval
+        self.vacuum_pages = vacuum_pages
+        self.last_report: MaintenanceReport | None = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="litequery-maintenance", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        conn = self._connect()
+        conn.execute("PRAGMA busy_timeout = 0")
+        data_version = None
+        next_optimize = time.monotonic() + self.optimize_interval
+        try:
+            while not self._stopped.wait(self.interval):
+                version = conn.execute("PRAGMA data_version").fetchone()[0]
+                idle, data_version = version == data_version, version
+                now = time.monotonic()
+                analyze = now >= next_optimize
+                try:
+                    self.last_report = maintain(
+                        conn,
+                        self._database_path,
+                        self._checkpoint_mode(),
+                        analyze=analyze,
+                        vacuum_pages=self.vacuum_pages if idle else 0,
+                    )
+                except sqlite3.OperationalError as e:
+                    if e.sqlite_errorcode & 0xFF != sqlite3.SQLITE_BUSY:
+                        logger.exception("Database maintenance failed")
+                if analyze:
+                    next_optimize = now + self.optimize_interval
+        finally:
+            conn.close()
+
+    def _checkpoint_mode(self) -> str:
+        if wal_size(self._database_path) >= self.checkpoint_threshold:
+            return "truncate"
+        return "passive"
@@ -1,64 +1,156 @@
 import glob
+import hashlib
 import os
 import re
 import sqlite3
-import textwrap
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 
-import sqlparse
-
 from litequery.config import Config
+from litequery.pragmas import PROFILES, merge_pragmas, pragma_statements
+
+MIGRATIONS_TABLE = """create table if not exists migrations (
+    id integer primary key autoincrement,
+    filename text not null,
+    run_at text not null default current_timestamp,
+    checksum text
+)"""
+
+
+@dataclass
+class Migration:
+    filename: str
+    sql: str
+    checksum: str
+    duration: float | None = None
 
 
-def migrate(config: Config):
-    conn = sqlite3.connect(config.database_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+def checksum(sql: str) -> str:
+    return hashlib.sha256(sql.encode()).hexdigest()
+
+
+def _connect(config: Config) -> sqlite3.Connection:
+    conn = sqlite3.connect(config.database_path, autocommit=True)
+    # Foreign keys stay off: table rebuilds would otherwise cascade deletes, and
+    # the pragma can't be switched inside the migration's transaction.
+    pragmas = merge_pragmas(PROFILES[config.profile], config.pragmas)
+    conn.executescript(
+        pragma_statements([p for p in pragmas if p[0] != "foreign_keys"])
+    )
+    conn.execute(MIGRATIONS_TABLE)
+    columns = {row[1] for row in conn.execute("pragma table_info(migrations)")}
+    if "checksum" not in columns:
+        conn.execute("alter table migrations add column checksum text")
+    return conn
+
 
+def _connect_readonly(config: Config) -> sqlite3.Connection:
+    # Opening a missing file read-only fails, and it has nothing applied yet.
+    if not config.database_path.exists():
+        return sqlite3.connect(":memory:", autocommit=True)
+    uri = f"{config.database_path.as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, autocommit=True)
+
+
+def _applied_checksums(conn: sqlite3.Connection) -> dict[str, str | None]:
+    columns = {row[1] for row in conn.execute("pragma table_info(migrations)")}
+    if not columns:
+        return {}
+    column = "checksum" if "checksum" in columns else "null"
+    return dict(conn.execute(f"select filename, {column} from migrations"))
+
+
+def pending_migrations(
+    conn: sqlite3.Connection, config: Config, readonly: bool = False
+) -> list[Migration]:
     filenames = sort_migration_filenames(
         os.path.basename(p) for p in glob.glob(f"{config.migrations_path}/*.sql")
     )
-    query = """
-        create table if not exists migrations (
-            id integer primary key autoincrement,
-            filename text not null,
-            run_at text not null default current_timestamp
-        );
-    """
-    cur.execute(textwrap.dedent(query).strip())
-    migrations = cur.execute("select * from migrations order by run_at asc").fetchall()
-    migrations = [m["filename"] for m in migrations]
-    unapplied = sort_migration_filenames(set(filenames) - set(migrations))
-
-    if not unapplied:
-        print("Nothing to apply.")
-        return
-
-    print("Applying migrations:")
-    for file in unapplied:
-        print(f"- {file}")
-        try:
-            conn.execute("BEGIN")
-            with open(f"{config.migrations_path}/{file}") as f:
-                migration_sql = f.read()
-
-            statements = sqlparse.split(migration_sql)
-            for statement in statements:
-                cur.execute(statement)
-
-            cur.execute(
-                "insert into migrations (filename) values (:filename)",
-                {"filename": file},
+    applied = _applied_checksums(conn)
+
+    pending = []
+    for filename in filenames:
+        with open(f"{config.migrations_path}/{filename}") as f:
+            sql = f.read()
+        digest = checksum(sql)
+        if filename not in applied:
+            pending.append(Migration(filename, sql, digest))
+        elif applied[filename] is None:
+            # Applied before checksums were recorded, trust the current file.
+            if readonly:
+                continue
+            conn.execute(
+                "update migrations set checksum = ? where filename = ?",
+                (digest, filename),
             )
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            print(f"Error applying migration {file}: {e}")
-            raise
-
-    generate_schema(cur, config)
-
-    conn.close()
+        elif applied[filename] != digest:
+            print(f"Warning: {filename} changed since it was applied.")
+    return pending
+
+
+def _apply(conn: sqlite3.Connection, migration: Migration):
+    started = time.perf_counter()
+    # executescript leaves the surrounding transaction alone in autocommit
+    # mode and lets SQLite split the statements itself.
+    conn.executescript(migration.sql)
+    conn.execute(
+        "insert into migrations (filename, checksum) values (?, ?)",
+        (migration.filename, migration.checksum),
+    )
+    migration.duration = time.perf_counter() - started
+
+
+def migrate(config: Config, dry_run: bool = False, batch: bool = False):
+    # A dry run only reads: no pragmas, no migrations table changes.
+    conn = _connect_readonly(config) if dry_run else _connect(config)
+    try:
+        pending = pending_migrations(conn, config, readonly=dry_run)
+        if not pending:
+            print("Nothing to apply.")
+            return []
+
+        if dry_run:
+            print("Migrations to apply:")
+            for migration in pending:
+                print(f"- {migration.filename}")
+            return pending
+
+        print("Applying migrations:")
+        if batch:
+            with _transaction(conn, "all pending migrations"):
+                for migration in pending:
+                    _apply(conn, migration)
+                    _report(migration)
+        else:
+            for migration in pending:
+                with _transaction(conn, f"migration {migration.filename}"):
+                    _apply(conn, migration)
+                _report(migration)
+
+        generate_schema(conn.cursor(), config)
+        return pending
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection, label: str):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except Exception as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"Error applying {label}: {e}")
+        raise
+    conn.execute("COMMIT")
+
+
+def _report(migration: Migration):
+    duration = migration.duration or 0.0
+    print(f"- {migration.filename} ({duration * 1000:.1f} ms)")
 
 
 def generate_schema(cur, config: Config):
@@ -0,0 +1,107 @@
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from litequery.core import Query
+
+SCAN = re.compile(r"SCAN (\w+)$")
+TEMP_BTREE = re.compile(r"USE TEMP B-TREE FOR (.+)")
+CORRELATED = re.compile(r"CORRELATED (?:SCALAR|LIST|ROW) SUBQUERY")
+TABLE_REF = re.compile(
+    r"\b(?:from|join|update|into)\s+(\w+)(?:\s+(?:as\s+)?(?!(?:where|on|set|join|"
+    r"left|right|inner|outer|cross|natural|group|order|limit|using|values)\b)(\w+))?",
+    re.IGNORECASE,
+)
+COMPARISON = r"(?:=|==|<=|>=|<|>|\bin\b|\blike\b|\bglob\b|\bbetween\b)"
+# Columns on either side of a comparison, parameters excluded.
+FILTERS = (
+    re.compile(rf"(?:\b(\w+)\.)?(?<!:)\b(\w+)\s*{COMPARISON}", re.IGNORECASE),
+    re.compile(rf"{COMPARISON}\s*(?:(\w+)\.)?(?<!:)\b(\w+)\b(?!\s*\()", re.IGNORECASE),
+)
+
+
+@dataclass
+class PlanIssue:
+    kind: str
+    detail: str
+    suggestion: str | None = None
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    plan: list[str] = field(default_factory=list)
+    issues: list[PlanIssue] = field(default_factory=list)
+    # Why the query wasn't explained, when it couldn't be.
+    skipped: str | None = None
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    cursor = conn.execute("SELECT name FROM pragma_table_info(?)", (table,))
+    cursor.row_factory = None
+    return {name.lower() for (name,) in cursor.fetchall()}
+
+
+def _filter_columns(sql: str, alias: str, table: str, columns: set[str]) -> list[str]:
+    found = []
+    for qualifier, column in chain(*(f.findall(sql) for f in FILTERS)):
+        column = column.lower()
+        if qualifier and qualifier.lower() not in (alias, table):
+            continue
+        if column in columns and column not in found:
+            found.append(column)
+    return found
+
+
+def explain_query(conn: sqlite3.Connection, query: "Query") -> QueryPlan:
+    result = QueryPlan(query.name)
+    try:
+        cursor = conn.execute(
+            f"EXPLAIN QUERY PLAN {query.sql}", dict.fromkeys(query.args)
+        )
+        cursor.row_factory = None
+        result.plan = [detail for _, _, _, detail in cursor.fetchall()]
+    except sqlite3.Error as e:
+        result.issues.append(PlanIssue("error", str(e)))
+        return result
+
+    if query.directives.get("check") == "ignore":
+        return result
+
+    aliases = _aliases(query.sql)
+    for detail in result.plan:
+        if match := SCAN.match(detail):
+            alias = match[1].lower()
+            table = aliases.get(alias)
+            if table is None:
+                continue  # A CTE or subquery, its own scans are listed too.
+            columns = _table_columns(conn, table)
+            filtered = _filter_columns(query.sql, alias, table, columns)
+            # Scanning a table nothing filters on is what the query asked for.
+            if filtered:
+                index = f"{table}_{'_'.join(filtered)}_idx"
+                suggestion = f"create index {index} on {table} ({', '.join(filtered)})"
+                result.issues.append(PlanIssue("scan", detail, suggestion))
+        elif TEMP_BTREE.match(detail):
+            result.issues.append(PlanIssue("temp-btree", detail))
+        elif CORRELATED.match(detail):
+            result.issues.append(PlanIssue("correlated-subquery", detail))
+    return result
+
+
+def explain_queries(
+    conn: sqlite3.Connection, queries: list["Query"]
+) -> list[QueryPlan]:
+    return [explain_query(conn, query) for query in queries]
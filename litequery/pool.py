@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from litequery.core import Connection
+
+
+@dataclass
+class PoolStats:
+    readers_open: int
+    readers_idle: int
+    readers_in_use: int
+    readers_opened: int
+    readers_evicted: int
+    reader_acquires: int
+    reader_waits: int
+    writer_acquires: int
+    writer_waits: int
+
+
+class ConnectionPool:
+    """Bounded pool of read-only connections plus one serialized writer.
+
+    Readers are handed out per query and returned afterwards, so connections
+    are shared between threads and never outlive the pool. All writes go
+    through a single connection guarded by a lock: writers queue on the lock
+    instead of spinning on SQLITE_BUSY. A thread holding the writer (e.g.
+    inside a transaction) keeps using it for reads too, and a thread that
+    pinned a reader (e.g. for a read snapshot) keeps getting that one.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[bool], "Connection"],
+        max_readers: int = 8,
+        idle_timeout: float = 60.0,
+        acquire_timeout: float = 30.0,
+        prepare: Callable[["Connection"], None] | None = None,
+    ):
+        if max_readers < 1:
+            raise ValueError("Pool needs at least one reader connection.")
+
+        self._connect = connect
+        self._idle_timeout = idle_timeout
+        self._acquire_timeout = acquire_timeout
+        self._prepare = prepare
+        self._slots = threading.BoundedSemaphore(max_readers)
+        self._idle: deque[tuple[Connection, float]] = deque()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+        self._writer_lock = threading.RLock()
+        self._writer = connect(False)
+
+        self._readers_open = 0
+        self._readers_in_use = 0
+        self._readers_opened = 0
+        self._readers_evicted = 0
+        self._reader_acquires = 0
+        self._reader_waits = 0
+        self._writer_acquires = 0
+        self._writer_waits = 0
+
+    def owns_writer(self) -> bool:
+        return getattr(self._local, "writer_depth", 0) > 0
+
+    def pins_reader(self) -> bool:
+        return getattr(self._local, "reader", None) is not None
+
+    @contextmanager
+    def connection(self, write: bool) -> Iterator["Connection"]:
+        if write or self.owns_writer():
+            with self.writer() as conn:
+                yield conn
+        else:
+            with self.reader() as conn:
+                yield conn
+
+    @contextmanager
+    def writer(self) -> Iterator["Connection"]:
+        self._check_open()
+        if not self._writer_lock.acquire(blocking=False):
+            with self._lock:
+                self._writer_waits += 1
+            if not self._writer_lock.acquire(timeout=self._acquire_timeout):
+                raise TimeoutError("Timed out waiting for the writer connection.")
+
+        depth = self._local.writer_depth = getattr(self._local, "writer_depth", 0) + 1
+        with self._lock:
+            self._writer_acquires += 1
+        try:
+            if depth == 1 and self._prepare is not None:
+                self._prepare(self._writer)
+            yield self._writer
+        finally:
+            self._local.writer_depth -= 1
+            self._writer_lock.release()
+
+    @contextmanager
+    def pinned_reader(self) -> Iterator["Connection"]:
+        if self.pins_reader():
+            yield self._local.reader
+            return
+        with self.reader() as conn:
+            self._local.reader = conn
+            try:
+                yield conn
+            finally:
+                self._local.reader = None
+
+    @contextmanager
+    def reader(self) -> Iterator["Connection"]:
+        if self.pins_reader():
+            yield self._local.reader
+            return
+        conn = self._acquire_reader()
+        try:
+            if self._prepare is not None:
+                self._prepare(conn)
+            yield conn
+        finally:
+            self._release_reader(conn)
+
+    def _acquire_reader(self) -> "Connection":
+        self._check_open()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._reader_waits += 1
+            if not self._slots.acquire(timeout=self._acquire_timeout):
+                raise TimeoutError("Timed out waiting for a reader connection.")
+
+        with self._lock:
+            self._reader_acquires += 1
+            self._readers_in_use += 1
+            self._evict_idle(time.monotonic())
+            if self._idle:
+                return self._idle.pop()[0]
+            self._readers_open += 1
+            self._readers_opened += 1
+
+        try:
+            return self._connect(True)
+        except BaseException:
+            with self._lock:
+                self._readers_open -= 1
+                self._readers_in_use -= 1
+            self._slots.release()
+            raise
+
+    def _release_reader(self, conn: "Connection"):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._readers_in_use -= 1
+            if self._closed:
+                self._readers_open -= 1
+                conn.close()
+            else:
+                now = time.monotonic()
+                self._idle.append((conn, now))
+                self._evict_idle(now)
+        self._slots.release()
+
+    def _evict_idle(self, now: float):
+        while self._idle and now - self._idle[0][1] > self._idle_timeout:
+            conn, _ = self._idle.popleft()
+            conn.close()
+            self._readers_open -= 1
+            self._readers_evicted += 1
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                readers_open=self._readers_open,
+                readers_idle=len(self._idle),
+                readers_in_use=self._readers_in_use,
+                readers_opened=self._readers_opened,
+                readers_evicted=self._readers_evicted,
+                reader_acquires=self._reader_acquires,
+                reader_waits=self._reader_waits,
+                writer_acquires=self._writer_acquires,
+                writer_waits=self._writer_waits,
+            )
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while self._idle:
+                self._idle.pop()[0].close()
+                self._readers_open -= 1
+        with self._writer_lock:
+            self._writer.close()
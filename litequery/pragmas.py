@@ -0,0 +1,80 @@
+import re
+
+PRAGMA_NAME = re.compile(r"\w+")
+PRAGMA_VALUE = re.compile(r"-?\d+|\w+")
+
+PROFILES: dict[str, list[tuple[str, str | int]]] = {
+    "default": [
+        ("journal_mode", "wal"),
+        ("foreign_keys", 1),
+        ("synchronous", "normal"),
+        ("mmap_size", 134217728),  # 128 Mb
+        ("journal_size_limit", 67108864),  # 64 Mb
+        ("cache_size", 2000),
+    ],
+    "read_heavy": [
+        ("journal_mode", "wal"),
+        ("foreign_keys", 1),
+        ("synchronous", "normal"),
+        ("mmap_size", 1073741824),  # 1 Gb
+        ("journal_size_limit", 67108864),  # 64 Mb
+        ("cache_size", -262144),  # 256 Mb
+        ("temp_store", "memory"),
+    ],
+    "write_heavy": [
+        ("journal_mode", "wal"),
+        ("foreign_keys", 1),
+        ("synchronous", "normal"),
+        ("mmap_size", 134217728),  # 128 Mb
+        ("journal_size_limit", 268435456),  # 256 Mb
+        ("cache_size", -65536),  # 64 Mb
+        ("wal_autocheckpoint", 10000),
+        ("temp_store", "memory"),
+    ],
+}
+
+# Only safe while nothing else uses the database: a crash in the middle of a
+# bulk load can corrupt it.
+BULK_LOAD_PRAGMAS: list[tuple[str, str | int]] = [
+    ("journal_mode", "off"),
+    ("synchronous", "off"),
+    ("cache_size", -262144),  # 256 Mb
+    ("temp_store", "memory"),
+]
+
+# Pragmas that can't be changed on read-only connections.
+WRITER_ONLY = frozenset({"journal_mode", "wal_autocheckpoint", "journal_size_limit"})
+
+
+def parse_value(value: str) -> str | int:
+    value = value.strip()
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def parse_pragmas(spec: str) -> dict[str, str | int]:
+    pragmas = {}
+    for item in spec.replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid pragma '{item.strip()}', expected name=value.")
+        pragmas[name.strip()] = parse_value(value)
+    return pragmas
+
+
+def merge_pragmas(
+    base: list[tuple[str, str | int]], overrides: dict[str, str | int]
+) -> list[tuple[str, str | int]]:
+    merged = dict(base)
+    merged.update(overrides)
+    return list(merged.items())
+
+
+def pragma_statements(pragmas: list[tuple[str, str | int]]) -> str:
+    statements = []
+    for name, value in pragmas:
+        if not PRAGMA_NAME.fullmatch(name) or not PRAGMA_VALUE.fullmatch(str(value)):
+            raise ValueError(f"Invalid pragma {name} = {value}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return ";".join(statements)
@@ -0,0 +1,91 @@
+import glob
+import re
+import threading
+import zlib
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from litequery.core import Litequery
+
+SHARD_DIRECTIVE = re.compile(r"(\w+)\s+(\w+)")
+TIME_FIELD = re.compile(r"\{[^}]*\}")
+
+
+def parse_shard_directive(directive: str) -> tuple[str, str]:
+    match = SHARD_DIRECTIVE.fullmatch(directive.strip())
+    if match is None:
+        raise ValueError(
+            f"Invalid shard directive '{directive}', expected '<group> <parameter>'."
+        )
+    return match[1], match[2]
+
+
+class HashShards:
+    """Fixed set of database files, picked by a stable hash of the shard key."""
+
+    def __init__(self, paths: list[Path], open_shard: Callable[[Path], "Litequery"]):
+        if not paths:
+            raise ValueError("A shard group needs at least one database.")
+        self.shards = [open_shard(path) for path in paths]
+
+    def for_key(self, value: Any) -> "Litequery":
+        digest = zlib.crc32(str(value).encode())
+        return self.shards[digest % len(self.shards)]
+
+    def all(self) -> list["Litequery"]:
+        return list(self.shards)
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+
+class TimeShards:
+    """One database file per period, named by formatting the key into a template.
+
+    The template holds a single format field, e.g. `events-{:%Y-%m}.db` for
+    monthly files. Files are opened the first time a key maps to them.
+    """
+
+    def __init__(self, template: Path, open_shard: Callable[[Path], "Litequery"]):
+        if len(TIME_FIELD.findall(template.name)) != 1:
+            raise ValueError(
+                f"Time shard template '{template}' needs exactly one format field."
+            )
+        self._template = template
+        self._open_shard = open_shard
+        self._shards: dict[Path, Litequery] = {}
+        self._lock = threading.Lock()
+
+    def for_key(self, value: Any) -> "Litequery":
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if not isinstance(value, date):
+            raise TypeError(
+                f"Time shard key must be a date or datetime, not {value!r}."
+            )
+        name = self._template.name.format(value)
+        return self._shard(self._template.with_name(name))
+
+    def all(self) -> list["Litequery"]:
+        pattern = TIME_FIELD.sub("*", self._template.name)
+        paths = sorted(glob.glob(str(self._template.with_name(pattern))))
+        return [self._shard(Path(path)) for path in paths]
+
+    def _shard(self, path: Path) -> "Litequery":
+        shard = self._shards.get(path)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(path)
+                if shard is None:
+                    shard = self._shards[path] = self._open_shard(path)
+        return shard
+
+    def close(self):
+        with self._lock:
+            for shard in self._shards.values():
+                shard.close()
+            self._shards.clear()
@@ -0,0 +1,101 @@
+import csv
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
+from typing import IO, Any
+
+FORMATS = ("csv", "ndjson")
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def export_rows(
+    cursor: sqlite3.Cursor, out: IO[str], fmt: str = "csv", batch_size: int = 1000
+) -> int:
+    """Write every row of `cursor` to `out`, holding one batch at a time."""
+    cursor.row_factory = None
+    names = [column[0] for column in cursor.description or ()]
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(names)
+        while batch := cursor.fetchmany(batch_size):
+            writer.writerows([_plain(v) for v in row] for row in batch)
+            count += len(batch)
+    elif fmt == "ndjson":
+        while batch := cursor.fetchmany(batch_size):
+            out.writelines(
+                json.dumps(dict(zip(names, map(_plain, row))), default=str) + "\n"
+                for row in batch
+            )
+            count += len(batch)
+    else:
+        raise ValueError(f"Unknown export format '{fmt}'.")
+    cursor.close()
+    return count
+
+
+def read_records(file: IO[str], fmt: str = "csv") -> Iterator[dict[str, Any]]:
+    if fmt == "csv":
+        # CSV can't tell NULL from an empty string, exports write NULL as "".
+        for record in csv.DictReader(file):
+            yield {k: (None if v == "" else v) for k, v in record.items()}
+    elif fmt == "ndjson":
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unknown import format '{fmt}'.")
+
+
+def import_records(
+    conn: sqlite3.Connection,
+    table: str,
+    records: Iterable[dict[str, Any]],
+    batch_size: int = 50_000,
+) -> int:
+    """Insert `records` into `table`, committing every `batch_size` rows.
+
+    Columns are taken from the first record; each batch is one prepared
+    `executemany` inside its own transaction.
+    """
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
+        return 0
+
+    columns = list(first)
+    sql = (
+        f"insert into {quote_identifier(table)} "
+        f"({', '.join(map(quote_identifier, columns))}) "
+        f"values ({', '.join('?' * len(columns))})"
+    )
+    count = 0
+    rows = (
+        tuple(record.get(c) for c in columns) for record in chain((first,), records)
+    )
+    while batch := list(islice(rows, batch_size)):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(sql, batch)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        count += len(batch)
+    return count
+
+
+def guess_format(path: str | None, default: str = "csv") -> str:
+    if path and path.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return default
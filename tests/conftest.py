@@ -4,12 +4,12 @@ import pytest
 
 import litequery
 
+QUERIES_PATH = "tests/queries"
+
 
 @pytest.fixture
-def lq(tmp_path):
+def db_path(tmp_path):
     db_path = tmp_path / "test.db"
-    queries_path = "tests/queries"
-
     with sqlite3.connect(db_path) as conn:
         conn.executescript("""
             create table users (
@@ -32,6 +32,11 @@ def lq(tmp_path):
             insert into events (user_id, name) values (2, 'password_changed');
         """)
         conn.commit()
-    lq = litequery.setup(db_path, queries_path)
+    return db_path
+
+
+@pytest.fixture
+def lq(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH)
     yield lq
     lq.close()
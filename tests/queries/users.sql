@@ -28,3 +28,10 @@ values
 
 -- name: delete_all_users!
 delete from users;
+
+-- name: update_user_email!
+update users
+set
+  email = :email
+where
+  id = :id;
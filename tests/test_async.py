@@ -0,0 +1,122 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import litequery
+from tests.conftest import QUERIES_PATH
+
+
+def run(db_path, scenario):
+    async def main():
+        async with litequery.setup(db_path, QUERIES_PATH, use_async=True) as lq:
+            return await scenario(lq)
+
+    return asyncio.run(main())
+
+
+def test_async_select(db_path):
+    async def scenario(lq):
+        users = await lq.get_all_users()
+        user = await lq.get_user_by_id(id=2)
+        return users, user
+
+    users, user = run(db_path, scenario)
+    assert len(users) == 3
+    assert user.name == "Bob"
+
+
+def test_async_raw(db_path):
+    async def scenario(lq):
+        return await lq.raw_value("select count(*) from users where id > :id", id=1)
+
+    assert run(db_path, scenario) == 2
+
+
+def test_async_concurrent_inserts(db_path):
+    async def scenario(lq):
+        await asyncio.gather(
+            *(lq.insert_user(name=f"user{i}", email=f"{i}@x") for i in range(100))
+        )
+        return await lq.raw_value("select count(*) from users")
+
+    assert run(db_path, scenario) == 103
+
+
+def test_async_transaction_rollback(db_path):
+    async def scenario(lq):
+        with pytest.raises(Exception, match="Force rollback"):
+            async with lq.transaction():
+                await lq.insert_user(name="Dave", email="dave@example.com")
+                raise Exception("Force rollback")
+        return await lq.get_all_users()
+
+    assert len(run(db_path, scenario)) == 3
+
+
+def test_async_transaction_commit(db_path):
+    async def scenario(lq):
+        async with lq.transaction():
+            await lq.insert_user(name="Dave", email="dave@example.com")
+            await lq.delete_all_users()
+        return await lq.get_all_users()
+
+    assert len(run(db_path, scenario)) == 0
+
+
+def test_async_unknown_attribute(db_path):
+    async def scenario(lq):
+        return lq.no_such_query
+
+    with pytest.raises(AttributeError):
+        run(db_path, scenario)
+
+
+def test_async_iter(db_path):
+    async def scenario(lq):
+        names = [user.name async for user in lq.get_all_users.iter(batch_size=2)]
+        ids = [row.id async for row in lq.raw_iter("select id from users")]
+        return names, ids
+
+    names, ids = run(db_path, scenario)
+    assert names == ["Alice", "Bob", "Charlie"]
+    assert ids == [1, 2, 3]
+
+
+def test_async_many(db_path):
+    async def scenario(lq):
+        rows = [{"name": f"user{i}", "email": f"{i}@x"} for i in range(3)]
+        return await lq.insert_user.many(rows)
+
+    assert run(db_path, scenario) == [4, 5, 6]
+
+
+def test_async_columnar(db_path):
+    async def scenario(lq):
+        columns = await lq.get_all_users.columnar()
+        raw = await lq.raw_columnar("select id from users where id > :id", id=1)
+        return columns["name"], list(raw["id"])
+
+    names, ids = run(db_path, scenario)
+    assert names == ["Alice", "Bob", "Charlie"]
+    assert ids == [2, 3]
+
+
+def test_async_read_snapshot(db_path):
+    async def scenario(lq):
+        async with lq.read_snapshot():
+            before = await lq.get_all_users()
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("insert into users (name, email) values ('Dave', 'd@x')")
+            during = await lq.get_all_users()
+        return len(before), len(during), len(await lq.get_all_users())
+
+    assert run(db_path, scenario) == (3, 3, 4)
+
+
+def test_async_paginate(db_path):
+    async def scenario(lq):
+        pages = lq.get_all_users.paginate(order_by="id desc", page_size=2)
+        return [[user.id for user in page] async for page in pages]
+
+    assert run(db_path, scenario) == [[3, 2], [1]]
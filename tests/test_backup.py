@@ -0,0 +1,62 @@
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+from litequery import cli
+
+
+def count_users(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("select count(*) from users").fetchone()[0]
+
+
+def test_backup(lq, tmp_path):
+    lq.insert_user.many([{"name": f"user{i}", "email": "x" * 500} for i in range(500)])
+    calls = []
+    target = lq.backup(
+        tmp_path / "backup.db",
+        pages_per_step=10,
+        progress=lambda status, remaining, total: calls.append(remaining),
+    )
+    assert count_users(target) == 503
+    assert len(calls) > 1
+    assert calls[-1] == 0
+    assert not (tmp_path / "backup.db.partial").exists()
+
+
+def test_backup_during_writes(lq, tmp_path):
+    lq.insert_user.many([{"name": f"user{i}", "email": "x" * 500} for i in range(500)])
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            lq.insert_user(name="writer", email="w@x")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        target = lq.backup(tmp_path / "backup.db", pages_per_step=5)
+    finally:
+        stop.set()
+        writer.join()
+    assert count_users(target) >= 503
+
+
+def test_backup_vacuum(lq, tmp_path):
+    target = lq.backup(tmp_path / "backup.db", vacuum=True)
+    assert count_users(target) == 3
+
+    with pytest.raises(sqlite3.OperationalError):
+        lq.backup(tmp_path / "missing" / "backup.db")
+    assert not (tmp_path / "missing" / "backup.db.partial").exists()
+
+
+def test_cli_backup(db_path, tmp_path, monkeypatch, capsys):
+    target = tmp_path / "cli.db"
+    monkeypatch.setenv("DATABASE_PATH", str(db_path))
+    monkeypatch.setattr(sys, "argv", ["lq", "backup", str(target)])
+    cli.main()
+    assert count_users(target) == 3
+    assert "Backed up" in capsys.readouterr().out
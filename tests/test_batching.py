@@ -0,0 +1,89 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+import litequery
+from tests.conftest import QUERIES_PATH
+
+
+@pytest.fixture
+def batched(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH, group_commit=True)
+    yield lq
+    lq.close()
+
+
+def test_group_commit_returns_results(batched):
+    user_id = batched.insert_user(name="Dave", email="dave@example.com")
+    assert user_id == 4
+    assert batched.delete_all_users() == 4
+
+
+def test_group_commit_concurrent_writers(batched):
+    user_ids = []
+
+    def write():
+        for i in range(20):
+            user_ids.append(batched.insert_user(name=f"user{i}", email=f"{i}@x"))
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(user_ids) == list(range(4, 164))
+    assert len(batched.get_all_users()) == 163
+
+
+def test_group_commit_isolates_failures(db_path):
+    lq = litequery.setup(
+        db_path, QUERIES_PATH, group_commit=True, group_commit_delay=0.05
+    )
+    results = {}
+
+    def write(name, email):
+        try:
+            results[name] = lq.insert_user(name=name, email=email)
+        except sqlite3.IntegrityError as e:
+            results[name] = e
+
+    threads = [
+        threading.Thread(target=write, args=("Dave", "dave@example.com")),
+        threading.Thread(target=write, args=("Nobody", None)),
+        threading.Thread(target=write, args=("Eve", "eve@example.com")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert isinstance(results["Nobody"], sqlite3.IntegrityError)
+    assert sorted(r for r in results.values() if isinstance(r, int)) == [4, 5]
+    assert len(lq.get_all_users()) == 5
+    lq.close()
+
+
+def test_group_commit_skipped_in_transaction(batched):
+    with pytest.raises(Exception, match="Force rollback"):
+        with batched.transaction():
+            batched.insert_user(name="Dave", email="dave@example.com")
+            raise Exception("Force rollback")
+    assert len(batched.get_all_users()) == 3
+
+
+def test_group_commit_async(db_path):
+    async def main():
+        lq = litequery.setup(db_path, QUERIES_PATH, use_async=True, group_commit=True)
+        async with lq:
+            user_ids = await asyncio.gather(
+                *(lq.insert_user(name=f"user{i}", email=f"{i}@x") for i in range(50))
+            )
+            count = await lq.raw_value("select count(*) from users")
+        return user_ids, count
+
+    user_ids, count = asyncio.run(main())
+    assert sorted(user_ids) == list(range(4, 54))
+    assert count == 53
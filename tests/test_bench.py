@@ -0,0 +1,49 @@
+import json
+import sys
+
+import pytest
+
+from litequery import cli
+from litequery.bench import BenchResult, compare, run_micro
+
+
+def test_run_micro():
+    results = run_micro(select="expand", repeat=1, number=1)
+    assert [r.name for r in results] == ["expand_parameters"]
+    assert results[0].ops_per_sec > 0
+    assert results[0].peak_bytes > 0
+
+
+def test_compare():
+    baseline = {
+        "fast": BenchResult("fast", 1000, 100),
+        "lean": BenchResult("lean", 1000, 100),
+    }
+    results = [
+        BenchResult("fast", 800, 100),
+        BenchResult("lean", 950, 200),
+        BenchResult("new", 1, 1),
+    ]
+    regressions = compare(results, baseline, threshold=0.1)
+    assert [(r.name, r.metric) for r in regressions] == [
+        ("fast", "ops_per_sec"),
+        ("lean", "peak_bytes"),
+    ]
+    assert regressions[0].change == pytest.approx(-0.2)
+
+
+def test_cli_bench(tmp_path, monkeypatch, capsys):
+    baseline = tmp_path / "baseline.json"
+    argv = ["lq", "bench", "--micro", "-k", "transaction", "--repeat", "1"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--save", str(baseline)])
+    cli.main()
+    assert "transaction" in json.loads(baseline.read_text())["results"]
+
+    data = json.loads(baseline.read_text())
+    data["results"]["transaction"]["ops_per_sec"] *= 1000
+    baseline.write_text(json.dumps(data))
+    monkeypatch.setattr(sys, "argv", [*argv, "--baseline", str(baseline)])
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main()
+    assert exc_info.value.code == 1
+    assert "Regression: transaction: ops_per_sec" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+import asyncio
+import io
+
+import pytest
+
+import litequery
+from tests.conftest import QUERIES_PATH
+
+PAYLOAD = bytes(range(256)) * 1000
+
+
+@pytest.fixture
+def files(lq):
+    lq.raw("create table files (id integer primary key, data blob)")
+    lq.raw("insert into files (id, data) values (1, :data)", data=PAYLOAD)
+    lq.raw("insert into files (id) values (2)")
+    return lq
+
+
+def test_read_blob(files):
+    out = io.BytesIO()
+    assert files.read_blob("files", "data", 1, out, chunk_size=1000) == len(PAYLOAD)
+    assert out.getvalue() == PAYLOAD
+    assert b"".join(files.iter_blob("files", "data", 1, chunk_size=4096)) == PAYLOAD
+
+
+def test_read_blob_into(files):
+    buffer = bytearray(1000)
+    view = files.read_blob_into("files", "data", 1, buffer, offset=256)
+    assert view == PAYLOAD[256:1256]
+    assert (
+        len(files.read_blob_into("files", "data", 1, buffer, offset=len(PAYLOAD))) == 0
+    )
+
+
+def test_blob_handle(files):
+    with files.blob("files", "data", 1, readonly=False) as blob:
+        blob.seek(10)
+        blob.write(b"xyz")
+    with files.blob("files", "data", 1) as blob:
+        assert len(blob) == len(PAYLOAD)
+        assert blob[9:14] == PAYLOAD[9:10] + b"xyz" + PAYLOAD[13:14]
+
+
+def test_write_blob(files, tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(PAYLOAD[::-1])
+    with path.open("rb") as source:
+        assert files.write_blob("files", "data", 2, source) == len(PAYLOAD)
+    assert files.raw_value("select data from files where id = 2") == PAYLOAD[::-1]
+
+    # A short source leaves the rest of the preallocated blob zeroed.
+    files.write_blob("files", "data", 2, io.BytesIO(b"abc"), size=5)
+    assert files.raw_value("select data from files where id = 2") == b"abc\0\0"
+
+    with pytest.raises(ValueError, match="No row"):
+        files.write_blob("files", "data", 3, io.BytesIO(b"abc"))
+
+
+def test_async_blobs(files, db_path):
+    async def main():
+        async with litequery.setup(db_path, QUERIES_PATH, use_async=True) as lq:
+            await lq.write_blob("files", "data", 2, io.BytesIO(b"async"))
+            return [chunk async for chunk in lq.iter_blob("files", "data", 1, 10000)]
+
+    chunks = asyncio.run(main())
+    assert len(chunks) == 26
+    assert b"".join(chunks) == PAYLOAD
+    assert files.raw_value("select data from files where id = 2") == b"async"
@@ -0,0 +1,145 @@
+import asyncio
+import sqlite3
+from dataclasses import dataclass
+
+import pytest
+
+import litequery
+
+QUERIES = """
+-- name: get_user_by_id^
+-- cache: size=2
+select * from users where id = :id;
+
+-- name: count_events$
+-- cache: ttl=60
+select count(*) from events;
+
+-- name: rename_user!
+update users set name = :name where id = :id;
+
+-- name: delete_events!
+delete from events;
+"""
+
+
+@pytest.fixture
+def cached(db_path, tmp_path):
+    queries_path = tmp_path / "queries"
+    queries_path.mkdir()
+    (queries_path / "queries.sql").write_text(QUERIES)
+    lq = litequery.setup(db_path, queries_path, cache_data_version=True)
+    yield lq
+    lq.close()
+
+
+def test_parse_cache_directive(cached):
+    query = cached._queries["get_user_by_id"]
+    assert query.directives == {"cache": "size=2"}
+    assert query.sql.strip() == "select * from users where id = :id"
+
+
+def test_cache_hits_and_misses(cached):
+    assert cached.get_user_by_id(id=1).name == "Alice"
+    assert cached.get_user_by_id(id=1).name == "Alice"
+    assert cached.get_user_by_id(id=2).name == "Bob"
+
+    stats = cached.cache.stats()["get_user_by_id"]
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+
+@dataclass
+class User:
+    id: int
+    name: str
+
+
+def test_cached_results_are_not_shared(cached):
+    user = cached.get_user_by_id.into(User, id=1)
+    user.name = "Changed"
+    assert cached.get_user_by_id.into(User, id=1).name == "Alice"
+    assert cached.get_user_by_id.into(User, id=1) is not user
+    assert cached.cache.stats()["get_user_by_id"].hits == 2
+
+
+def test_cache_evicts_least_recently_used(cached):
+    for user_id in (1, 2, 3):
+        cached.get_user_by_id(id=user_id)
+    assert cached.cache.stats()["get_user_by_id"].evictions == 1
+
+
+def test_cache_invalidated_by_writes_to_same_table(cached):
+    assert cached.count_events() == 2
+    cached.rename_user(id=1, name="Alicia")
+    assert cached.count_events() == 2
+    assert cached.cache.stats()["count_events"].hits == 1
+
+    cached.delete_events()
+    assert cached.count_events() == 0
+
+
+def test_cache_invalidated_after_transaction(cached):
+    cached.get_user_by_id(id=1)
+    with cached.transaction():
+        cached.rename_user(id=1, name="Alicia")
+        assert cached.get_user_by_id(id=1).name == "Alicia"
+    assert cached.get_user_by_id(id=1).name == "Alicia"
+
+
+def test_cache_invalidated_by_other_connections(cached, db_path):
+    assert cached.get_user_by_id(id=1).name == "Alice"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("update users set name = 'Alicia' where id = 1")
+    assert cached.get_user_by_id(id=1).name == "Alicia"
+
+
+def test_cache_rejects_write_queries(db_path, tmp_path):
+    (tmp_path / "queries.sql").write_text(
+        "-- name: delete_events!\n-- cache: ttl=1\ndelete from events;\n"
+    )
+    with pytest.raises(ValueError):
+        litequery.setup(db_path, tmp_path)
+
+
+def test_cache_invalidated_through_comma_joins(db_path, tmp_path):
+    queries_path = tmp_path / "joined"
+    queries_path.mkdir()
+    (queries_path / "queries.sql").write_text(
+        "-- name: count_user_events$\n"
+        "-- cache: ttl=60\n"
+        "select count(*) from users u, events e where e.user_id = u.id;\n"
+        "\n"
+        "-- name: delete_events!\n"
+        "delete from events;\n"
+    )
+    lq = litequery.setup(db_path, queries_path)
+    assert lq.count_user_events() == 2
+    lq.delete_events()
+    assert lq.count_user_events() == 0
+    lq.close()
+
+
+def test_cache_invalidated_by_raw_writes(cached):
+    assert cached.count_events() == 2
+    cached.raw("delete from events where user_id = 1")
+    assert cached.count_events() == 1
+    # Statements naming no table clear the whole cache.
+    cached.raw("pragma user_version = 1")
+    assert cached.count_events() == 1
+    assert cached.cache.stats()["count_events"].hits == 0
+
+
+def test_async_group_commit_invalidates_cache(db_path, tmp_path):
+    queries_path = tmp_path / "queries"
+    queries_path.mkdir()
+    (queries_path / "queries.sql").write_text(QUERIES)
+
+    async def main():
+        async with litequery.setup(
+            db_path, queries_path, use_async=True, group_commit=True
+        ) as lq:
+            assert (await lq.get_user_by_id(id=1)).name == "Alice"
+            await lq.rename_user(id=1, name="Alicia")
+            return (await lq.get_user_by_id(id=1)).name
+
+    assert asyncio.run(main()) == "Alicia"
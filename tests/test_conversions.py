@@ -1,4 +1,13 @@
+import sqlite3
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+import litequery
+from litequery.converters import Pending
+from tests.conftest import QUERIES_PATH
 
 
 def test_naive_datetime_roundtrip(lq):
@@ -25,3 +34,93 @@ def test_datetime_column_is_naive(lq):
 
     assert isinstance(user.created_at, datetime)
     assert user.created_at.tzinfo is None
+
+
+def test_datetime_converted_on_access(lq):
+    user = lq.get_user_by_id(id=1)
+    assert isinstance(user._values[3], Pending)
+    created_at = user.created_at
+    assert user._values[3] is created_at
+    assert user.to_dict()["created_at"] is created_at
+
+
+def test_converted_everywhere(lq):
+    @dataclass
+    class User:
+        id: int
+        created_at: datetime
+
+    assert isinstance(lq.get_user_by_id.into(User, id=1).created_at, datetime)
+    assert isinstance(lq.get_all_users().into(User)[0].created_at, datetime)
+    assert isinstance(list(lq.get_user_by_id(id=1))[3], datetime)
+    assert isinstance(lq.get_all_users.columnar()["created_at"][0], datetime)
+    assert isinstance(next(lq.get_all_users.iter()).created_at, datetime)
+
+
+def test_fast_converters(db_path):
+    lq = litequery.setup(
+        db_path,
+        QUERIES_PATH,
+        converters={"epoch": "epoch", "json": "json", "decimal": "decimal"},
+    )
+    row = lq.raw_one(
+        "select 1700000000 as 'at [epoch]', '{\"a\": [1]}' as 'doc [json]', "
+        "'1.10' as 'price [decimal]'"
+    )
+    assert row.at == datetime(2023, 11, 14, 22, 13, 20)
+    assert row.doc == {"a": [1]}
+    assert row.price == Decimal("1.10")
+    lq.close()
+
+    # Converters are per instance, others leave the values as stored.
+    lq = litequery.setup(db_path, QUERIES_PATH)
+    assert lq.raw_value("select '{}' as 'doc [json]'") == "{}"
+    lq.close()
+
+    with pytest.raises(ValueError, match="Unknown converter"):
+        litequery.setup(db_path, QUERIES_PATH, converters={"json": "yaml"})
+
+
+def test_custom_converter_and_disabling(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH, converters={"datetime": None})
+    assert isinstance(lq.get_user_by_id(id=1).created_at, str)
+    lq.close()
+
+    lq = litequery.setup(
+        db_path, QUERIES_PATH, converters={"upper": lambda v: v.decode().upper()}
+    )
+    assert lq.raw_value("select 'abc' as 'v [upper]'") == "ABC"
+    lq.close()
+
+
+def test_convert_directive(db_path, tmp_path):
+    path = tmp_path / "queries"
+    path.mkdir()
+    (path / "users.sql").write_text(
+        "-- name: get_raw_users\n-- convert: off\nselect * from users;\n"
+    )
+    lq = litequery.setup(db_path, path)
+    users = lq.get_raw_users()
+    assert isinstance(users[0].created_at, str)
+    assert isinstance(lq.get_raw_users.columnar()["created_at"][0], str)
+    lq.close()
+
+    (path / "users.sql").write_text(
+        "-- name: get_raw_users\n-- convert: maybe\nselect * from users;\n"
+    )
+    with pytest.raises(ValueError, match="convert directive"):
+        litequery.setup(db_path, path)
+
+
+def test_plain_sqlite3_connections_are_untouched(db_path, monkeypatch):
+    monkeypatch.setitem(sqlite3.converters, "DATETIME", lambda v: ("mine", v))
+    lq = litequery.setup(db_path, QUERIES_PATH, converters={"json": "json"})
+    assert isinstance(lq.get_user_by_id(id=1).created_at, datetime)
+    lq.close()
+
+    detect_types = sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+    conn = sqlite3.connect(db_path, detect_types=detect_types)
+    (created_at,) = conn.execute("select created_at from users").fetchone()
+    assert created_at[0] == "mine"
+    assert conn.execute("select '[]' as 'doc [json]'").fetchone() == ("[]",)
+    conn.close()
@@ -0,0 +1,73 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+import litequery
+from litequery.core import DeferredQuery
+from tests.conftest import QUERIES_PATH
+
+
+def test_gather(lq):
+    users, user, last_id = lq.gather(
+        lq.q.get_all_users(), lq.q.get_user_by_id(id=2), lq.q.get_last_user_id()
+    )
+    assert len(users) == 3
+    assert user.name == "Bob"
+    assert last_id == 3
+
+
+def test_gather_runs_concurrently(lq):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_others():
+        barrier.wait()
+        return lq.get_user_by_id(id=1).name
+
+    # Every query blocks until the other two started, so they can't run in turn.
+    queries = [DeferredQuery(wait_for_others, {}) for _ in range(3)]
+    assert lq.gather(*queries) == ["Alice"] * 3
+    assert len(lq._gather_connections) == 3
+
+
+def test_gather_errors(lq):
+    lq.raw("drop table events")
+    with pytest.raises(sqlite3.OperationalError):
+        lq.gather(lq.q.get_all_users(), lq.q.get_all_events())
+
+    users, error = lq.gather(
+        lq.q.get_all_users(), lq.q.get_all_events(), return_exceptions=True
+    )
+    assert len(users) == 3
+    assert isinstance(error, sqlite3.OperationalError)
+
+
+def test_gather_rejects_writes(lq):
+    with pytest.raises(TypeError):
+        lq.q.delete_all_users()
+
+
+def test_gather_in_transaction(lq):
+    with lq.transaction():
+        lq.insert_user(name="Dora", email="dora@example.com")
+        (users,) = lq.gather(lq.q.get_all_users())
+    assert len(users) == 4
+
+
+def test_gather_pooled(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH, pool_size=4)
+    users, user = lq.gather(lq.q.get_all_users(), lq.q.get_user_by_id(id=1))
+    assert len(users) == 3
+    assert user.name == "Alice"
+    lq.close()
+
+
+def test_async_gather(db_path):
+    async def main():
+        async with litequery.setup(db_path, QUERIES_PATH, use_async=True) as lq:
+            return await lq.gather(lq.q.get_all_users(), lq.q.get_user_by_id(id=3))
+
+    users, user = asyncio.run(main())
+    assert len(users) == 3
+    assert user.name == "Charlie"
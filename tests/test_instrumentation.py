@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+
+import litequery
+from tests.conftest import QUERIES_PATH
+
+
+@pytest.fixture
+def instrumented(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH, instrument=True)
+    yield lq
+    lq.close()
+
+
+def test_instrumentation_disabled_by_default(lq):
+    assert lq.instrumentation is None
+
+
+def test_instrumentation_records_named_queries(instrumented):
+    instrumented.get_all_users()
+    instrumented.get_all_users()
+    instrumented.get_user_by_id(id=1)
+    instrumented.delete_all_users()
+
+    stats = instrumented.instrumentation.snapshot()
+    assert stats["get_all_users"].calls == 2
+    assert stats["get_all_users"].rows == 6
+    assert stats["get_all_users"].bytes > 0
+    assert sum(stats["get_all_users"].histogram) == 2
+    assert stats["get_user_by_id"].rows == 1
+    assert stats["delete_all_users"].rows == 3
+
+
+def test_instrumentation_records_errors(instrumented):
+    with pytest.raises(ValueError):
+        instrumented.raw("select * from users where id in (:ids)", ids=[])
+    assert instrumented.instrumentation.snapshot()["raw"].errors == 1
+
+
+def test_instrumentation_callbacks(instrumented):
+    events = []
+    instrumented.instrumentation.add_callback(events.append)
+    instrumented.get_user_by_id(id=1)
+
+    assert events[0].name == "get_user_by_id"
+    assert events[0].parameters == {"id": "int"}
+    assert events[0].rows == 1
+
+
+def test_instrumentation_records_many(instrumented):
+    rows = [{"name": f"user{i}", "email": f"{i}@example.com"} for i in range(5)]
+    instrumented.insert_user.many(rows, chunk_size=2)
+    instrumented.update_user_email.many(
+        [{"id": 1, "email": "a"}, {"id": 2, "email": "b"}]
+    )
+
+    stats = instrumented.instrumentation.snapshot()
+    assert stats["insert_user"].calls == 3
+    assert stats["insert_user"].rows == 5
+    assert stats["update_user_email"].calls == 1
+    assert stats["update_user_email"].rows == 2
+
+
+def test_slow_query_log(db_path, caplog):
+    lq = litequery.setup(db_path, QUERIES_PATH, slow_query_threshold=0)
+    with caplog.at_level(logging.WARNING, logger="litequery"):
+        lq.get_user_by_id(id=1)
+    lq.close()
+
+    assert "Slow query get_user_by_id" in caplog.text
+    assert "USING INTEGER PRIMARY KEY" in caplog.text
+
+
+def test_slow_query_log_many(db_path, caplog):
+    lq = litequery.setup(db_path, QUERIES_PATH, slow_query_threshold=0)
+    with caplog.at_level(logging.WARNING, logger="litequery"):
+        lq.update_user_email.many([{"id": 1, "email": "a"}])
+    lq.close()
+
+    assert "Slow query update_user_email" in caplog.text
@@ -0,0 +1,64 @@
+import sqlite3
+import sys
+import time
+
+import litequery
+from litequery import cli
+from litequery.maintenance import wal_size
+from tests.conftest import QUERIES_PATH
+
+
+def fill_and_delete(lq):
+    with lq.transaction():
+        for i in range(200):
+            lq.insert_user(name=f"user{i}", email="x" * 2000)
+    lq.delete_all_users()
+
+
+def test_maintain_checkpoints_and_vacuums(tmp_path):
+    db_path = tmp_path / "vacuum.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            pragma auto_vacuum = incremental;
+            create table users (id integer primary key, name text, email text);
+            create table events (id integer primary key, user_id integer, name text);
+        """)
+    lq = litequery.setup(db_path, QUERIES_PATH)
+    fill_and_delete(lq)
+    assert wal_size(db_path) > 0
+
+    report = lq.maintain("truncate", vacuum_pages=None)
+    assert report.checkpoint[0] == 0
+    assert report.optimized
+    assert lq.raw_value("pragma analysis_limit") == 0
+    assert report.vacuumed_pages > 0
+    assert lq.raw_value("pragma freelist_count") == 0
+    lq.maintain("truncate", analyze=False)
+    assert wal_size(db_path) == 0
+    lq.close()
+
+
+def test_background_maintenance(db_path):
+    lq = litequery.setup(
+        db_path,
+        QUERIES_PATH,
+        maintenance=True,
+        maintenance_interval=0.01,
+        checkpoint_threshold=0,
+    )
+    fill_and_delete(lq)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if not wal_size(db_path) and lq.maintenance.last_report is not None:
+            break
+        time.sleep(0.01)
+    assert wal_size(db_path) == 0
+    assert lq.maintenance.last_report is not None
+    lq.close()
+
+
+def test_cli_maintain(db_path, monkeypatch, capsys):
+    monkeypatch.setenv("DATABASE_PATH", str(db_path))
+    monkeypatch.setattr(sys, "argv", ["lq", "maintain", "--checkpoint", "passive"])
+    cli.main()
+    assert "Ran PRAGMA optimize." in capsys.readouterr().out
@@ -8,7 +8,7 @@ from pathlib import Path
 import pytest
 
 from litequery.config import get_config
-from litequery.migrations import migrate
+from litequery.migrations import checksum, migrate
 
 
 @pytest.fixture
@@ -75,7 +75,8 @@ def test_creates_schema(temp_db, temp_migrations_dir):
             CREATE TABLE migrations (
                 id integer primary key autoincrement,
                 filename text not null,
-                run_at text not null default current_timestamp
+                run_at text not null default current_timestamp,
+                checksum text
             );
             CREATE TABLE sqlite_sequence(name,seq);
             CREATE TABLE users (id integer primary key autoincrement);
@@ -143,3 +144,94 @@ def test_migration_rollback_on_failure(temp_db: Path, temp_migrations_dir: Path)
         assert "no such table: products" in str(e)
 
     conn.close()
+
+
+def applied(temp_db):
+    with sqlite3.connect(temp_db) as conn:
+        return conn.execute("select filename, checksum from migrations").fetchall()
+
+
+def test_migrate_dry_run(temp_db, temp_migrations_dir, capsys):
+    create_migration_file(
+        temp_migrations_dir, "001_initial.sql", "create table a (id);"
+    )
+
+    pending = migrate(get_config(str(temp_db)), dry_run=True)
+    assert [m.filename for m in pending] == ["001_initial.sql"]
+    assert "- 001_initial.sql" in capsys.readouterr().out
+    with sqlite3.connect(temp_db) as conn:
+        assert conn.execute("select name from sqlite_master").fetchall() == []
+    conn.close()
+
+
+def test_migrate_dry_run_is_read_only(temp_db, temp_migrations_dir, capsys):
+    with sqlite3.connect(temp_db) as conn:
+        conn.execute(
+            "create table migrations (id integer primary key autoincrement, "
+            "filename text not null, "
+            "run_at text not null default current_timestamp)"
+        )
+        conn.execute("insert into migrations (filename) values ('001_initial.sql')")
+    conn.close()
+    create_migration_file(temp_migrations_dir, "001_initial.sql", "select 1;")
+    create_migration_file(temp_migrations_dir, "002_next.sql", "create table a (id);")
+
+    def state():
+        with sqlite3.connect(temp_db) as conn:
+            journal_mode = conn.execute("pragma journal_mode").fetchone()[0]
+            schema = conn.execute("select sql from sqlite_master").fetchall()
+            rows = conn.execute("select * from migrations").fetchall()
+        conn.close()
+        return journal_mode, schema, rows
+
+    before = state()
+    pending = migrate(get_config(str(temp_db)), dry_run=True)
+    assert [m.filename for m in pending] == ["002_next.sql"]
+    assert state() == before
+    assert before[0] == "delete"
+
+
+def test_migrate_records_checksums(temp_db, temp_migrations_dir, capsys):
+    sql = (
+        "create table a (id);\n"
+        "-- a comment; with a semicolon\n"
+        "insert into a values (';');"
+    )
+    create_migration_file(temp_migrations_dir, "001_initial.sql", sql)
+
+    [migration] = migrate(get_config(str(temp_db)))
+    assert migration.duration is not None
+    assert applied(temp_db) == [("001_initial.sql", checksum(sql))]
+
+    create_migration_file(temp_migrations_dir, "001_initial.sql", sql + "\n")
+    assert migrate(get_config(str(temp_db))) == []
+    assert "001_initial.sql changed since it was applied" in capsys.readouterr().out
+
+
+def test_migrate_backfills_checksums(temp_db, temp_migrations_dir):
+    with sqlite3.connect(temp_db) as conn:
+        conn.execute(
+            "create table migrations (id integer primary key autoincrement, "
+            "filename text not null, "
+            "run_at text not null default current_timestamp)"
+        )
+        conn.execute("insert into migrations (filename) values ('001_initial.sql')")
+    create_migration_file(temp_migrations_dir, "001_initial.sql", "select 1;")
+
+    migrate(get_config(str(temp_db)))
+    assert applied(temp_db) == [("001_initial.sql", checksum("select 1;"))]
+
+
+def test_migrate_batch_rolls_back_everything(temp_db, temp_migrations_dir):
+    create_migration_file(
+        temp_migrations_dir, "001_initial.sql", "create table a (id);"
+    )
+    create_migration_file(temp_migrations_dir, "002_broken.sql", "create table a (id);")
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(get_config(str(temp_db)), batch=True)
+    assert applied(temp_db) == []
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(get_config(str(temp_db)))
+    assert [filename for filename, _ in applied(temp_db)] == ["001_initial.sql"]
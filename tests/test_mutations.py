@@ -1,3 +1,8 @@
+import pytest
+
+import litequery
+
+
 def test_insert_returning(lq):
     user_id = lq.insert_user(name="Dave", email="dave@example.com")
     assert user_id == 4
@@ -16,3 +21,45 @@ def test_delete(lq):
 
     users = lq.get_all_users()
     assert len(users) == 0
+
+
+def test_insert_many_returns_ids(lq):
+    rows = ({"name": f"user{i}", "email": f"user{i}@example.com"} for i in range(5))
+    user_ids = lq.insert_user.many(rows)
+    assert user_ids == [4, 5, 6, 7, 8]
+    assert len(lq.get_all_users()) == 8
+
+
+def test_modify_many_returns_rowcount(lq):
+    rows = [{"id": i, "email": f"{i}@example.com"} for i in (1, 2, 3, 42)]
+    assert lq.update_user_email.many(rows, chunk_size=3) == 3
+    assert lq.get_user_by_id(id=3).email == "3@example.com"
+
+
+def test_many_rolls_back_on_failure(lq):
+    rows = [{"name": "Dave", "email": "dave@example.com"}, {"name": None}]
+    with pytest.raises(Exception):
+        lq.insert_user.many(rows)
+    assert len(lq.get_all_users()) == 3
+
+
+def test_many_requires_modify_query(lq):
+    with pytest.raises(TypeError):
+        lq.get_all_users.many([{}])
+
+
+def test_many_expands_list_parameters(db_path, tmp_path):
+    (tmp_path / "queries.sql").write_text(
+        "-- name: rename_users!\n"
+        "update users set name = :name where id in (:ids);\n"
+        "\n"
+        "-- name: insert_event<!\n"
+        "insert into events (user_id, name)\n"
+        "select id, :name from users where id in (:ids) limit 1;\n"
+    )
+    lq = litequery.setup(db_path, tmp_path)
+    rows = [{"name": "x", "ids": [1, 2]}, {"name": "y", "ids": [3]}]
+    assert lq.rename_users.many(rows, chunk_size=1) == 3
+    assert [u.name for u in lq.raw("select name from users")] == ["x", "x", "y"]
+    assert lq.insert_event.many([{"name": "z", "ids": [2, 3]}]) == [3]
+    lq.close()
@@ -1,9 +1,58 @@
 from pathlib import Path
 
-from litequery.core import parse_queries
+import pytest
+
+from litequery import core
+from litequery.core import Op, load_queries, parse_queries, setup
 
 
 def test_parse_queries_from_directory():
     queries_path = Path("tests/queries").resolve()
     queries = parse_queries(queries_path)
-    assert len(queries) == 6
+    assert len(queries) == 7
+
+
+def test_load_queries_uses_cached_catalog(tmp_path, monkeypatch):
+    queries_file = tmp_path / "queries.sql"
+    queries_file.write_text("-- name: get_one$\nselect 1;\n")
+    assert [q.name for q in load_queries(tmp_path)] == ["get_one"]
+
+    def fail(path):
+        raise AssertionError("catalog should have been cached")
+
+    monkeypatch.setattr(core, "parse_queries", fail)
+    queries = load_queries(tmp_path)
+    assert queries[0].op == Op.SELECT_VALUE
+    assert queries[0].sql == "select 1"
+
+
+def test_load_queries_refreshes_changed_files(tmp_path):
+    queries_file = tmp_path / "queries.sql"
+    queries_file.write_text("-- name: get_one$\nselect 1;\n")
+    load_queries(tmp_path)
+
+    queries_file.write_text(
+        "-- name: get_two$\nselect 2;\n-- name: get_three$\nselect 3;\n"
+    )
+    assert [q.name for q in load_queries(tmp_path)] == ["get_two", "get_three"]
+
+
+def test_query_methods_are_created_lazily(lq):
+    assert "get_all_users" not in vars(lq)
+    assert lq.get_all_users is lq.get_all_users
+    assert "get_all_users" in vars(lq)
+    with pytest.raises(AttributeError):
+        lq.no_such_query
+
+
+def test_reserved_query_name(tmp_path):
+    (tmp_path / "queries.sql").write_text("-- name: transaction\nselect 1;\n")
+    with pytest.raises(NameError):
+        setup(tmp_path / "test.db", tmp_path)
+
+
+@pytest.mark.parametrize("name", ["cache", "maintenance", "databases", "shards"])
+def test_query_names_reserved_by_attributes(tmp_path, name):
+    (tmp_path / "queries.sql").write_text(f"-- name: {name}\nselect 1;\n")
+    with pytest.raises(NameError):
+        setup(tmp_path / "test.db", tmp_path)
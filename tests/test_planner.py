@@ -0,0 +1,112 @@
+import sys
+
+import pytest
+
+import litequery
+from litequery import cli
+
+QUERIES = """
+-- name: get_user_by_email^
+select * from users where email = :email;
+
+-- name: get_user_events
+select e.* from events e join users u on u.id = e.user_id
+where u.id = :user_id order by e.name;
+
+-- name: get_users_with_event_count
+select u.*, (select count(*) from events e where e.user_id = u.id) as n
+from users u;
+
+-- name: search_users
+-- check: ignore
+select * from users where name like :pattern;
+
+-- name: delete_by_email!
+delete from users where email = :email;
+"""
+
+
+@pytest.fixture
+def queries_path(tmp_path):
+    path = tmp_path / "queries"
+    path.mkdir()
+    (path / "queries.sql").write_text(QUERIES)
+    return path
+
+
+def test_explain_all(db_path, queries_path):
+    lq = litequery.setup(db_path, queries_path)
+    plans = {plan.name: plan for plan in lq.explain_all()}
+
+    [scan] = plans["get_user_by_email"].issues
+    assert scan.kind == "scan"
+    assert scan.suggestion == "create index users_email_idx on users (email)"
+    assert [i.kind for i in plans["get_user_events"].issues] == ["scan", "temp-btree"]
+    assert "correlated-subquery" in {
+        i.kind for i in plans["get_users_with_event_count"].issues
+    }
+    assert plans["search_users"].plan and not plans["search_users"].issues
+    assert plans["delete_by_email"].issues[0].kind == "scan"
+
+    lq.raw("create index users_email_idx on users (email)")
+    plans = {plan.name: plan for plan in lq.explain_all()}
+    assert plans["get_user_by_email"].issues == []
+    lq.close()
+
+
+def test_explain_all_clean_catalog(lq):
+    assert all(not plan.issues for plan in lq.explain_all())
+
+
+def test_cli_check(db_path, queries_path, monkeypatch, capsys):
+    monkeypatch.setenv("DATABASE_PATH", str(db_path))
+    monkeypatch.setattr(sys, "argv", ["lq", "check"])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 1
+    out = capsys.readouterr().out
+    assert "suggestion: create index users_email_idx on users (email)" in out
+    assert "search_users" not in out
+
+
+ROUTED_QUERIES = """
+-- name: get_audit_entries
+-- database: audit
+select * from entries where message = :message;
+
+-- name: get_tenant_notes
+-- shard: tenants tenant_id
+select * from notes where tenant_id = :tenant_id;
+"""
+
+
+def test_explain_routed_queries(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "routed" / "test.db"
+    queries_path = tmp_path / "routed" / "queries"
+    queries_path.mkdir(parents=True)
+    (queries_path / "queries.sql").write_text(ROUTED_QUERIES)
+    lq = litequery.setup(
+        db_path,
+        queries_path,
+        databases={"audit": "audit.db"},
+        shards={"tenants": "tenants/{:%Y}.db"},
+    )
+    lq.databases["audit"].raw("create table entries (id integer primary key, message)")
+    plans = {plan.name: plan for plan in lq.explain_all()}
+    assert plans["get_audit_entries"].issues[0].kind == "scan"
+    assert plans["get_tenant_notes"].skipped == "no shard exists yet"
+
+    lq.shards["tenants"].for_key("2024-01-01").raw(
+        "create table notes (id integer primary key, tenant_id, body)"
+    )
+    plans = {plan.name: plan for plan in lq.explain_all()}
+    assert plans["get_tenant_notes"].skipped is None
+    assert plans["get_tenant_notes"].issues[0].kind == "scan"
+    lq.close()
+
+    monkeypatch.setenv("DATABASE_PATH", str(db_path))
+    monkeypatch.setattr(sys, "argv", ["lq", "check"])
+    cli.main()
+    out = capsys.readouterr().out
+    assert "get_audit_entries\n  skipped: routed to another database" in out
+    assert out.endswith("Checked 0 queries, 0 with issues, 2 skipped.\n")
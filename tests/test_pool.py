@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+
+import pytest
+
+import litequery
+from tests.conftest import QUERIES_PATH
+
+
+@pytest.fixture
+def pooled(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH, pool_size=2)
+    yield lq
+    lq.close()
+
+
+def test_pool_reads_and_writes(pooled):
+    user_id = pooled.insert_user(name="Dave", email="dave@example.com")
+    assert pooled.get_user_by_id(id=user_id).name == "Dave"
+    assert len(pooled.get_all_users()) == 4
+
+
+def test_pool_readers_are_read_only(pooled):
+    with pytest.raises(sqlite3.OperationalError):
+        pooled.raw("delete from users")
+
+
+def test_pool_reuses_readers_across_threads(pooled):
+    def read():
+        for _ in range(10):
+            assert len(pooled.get_all_users()) == 3
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pooled.pool.stats()
+    assert stats.readers_open <= 2
+    assert stats.readers_in_use == 0
+    assert stats.reader_acquires == 80
+
+
+def test_pool_transaction_reads_own_writes(pooled):
+    with pytest.raises(Exception, match="Force rollback"):
+        with pooled.transaction():
+            pooled.insert_user(name="Dave", email="dave@example.com")
+            assert len(pooled.get_all_users()) == 4
+            raise Exception("Force rollback")
+    assert len(pooled.get_all_users()) == 3
+
+
+def test_pool_iter_releases_reader(pooled):
+    assert [u.id for u in pooled.get_all_users.iter(batch_size=1)] == [1, 2, 3]
+    assert pooled.pool.stats().readers_in_use == 0
+
+
+def test_pool_evicts_idle_readers(db_path):
+    lq = litequery.setup(db_path, QUERIES_PATH, pool_size=2, pool_idle_timeout=0)
+    lq.get_all_users()
+    lq.get_all_users()
+    stats = lq.pool.stats()
+    lq.close()
+    assert stats.readers_evicted >= 1
@@ -1,3 +1,11 @@
+import threading
+
+import pytest
+
+import litequery
+from tests.conftest import QUERIES_PATH
+
+
 def test_foreign_keys_enabled(lq):
     events = lq.get_all_events()
     assert len(events) == 2
@@ -22,3 +30,89 @@ def test_pragmas_configured(lq):
     for pragma, expected_value in expected_pragmas:
         value = lq.raw_value(f"pragma {pragma}")
         assert value == expected_value
+
+
+def test_pragma_profile(db_path):
+    lq = litequery.setup(
+        db_path, QUERIES_PATH, profile="read_heavy", pragmas={"cache_size": -1000}
+    )
+    assert lq.raw_value("pragma mmap_size") == 1073741824
+    assert lq.raw_value("pragma cache_size") == -1000
+    lq.close()
+
+
+def test_pragma_profile_from_env(db_path, monkeypatch):
+    monkeypatch.setenv("LITEQUERY_PROFILE", "write_heavy")
+    monkeypatch.setenv("LITEQUERY_PRAGMAS", "wal_autocheckpoint=500")
+    lq = litequery.setup(db_path, QUERIES_PATH)
+    assert lq.pragmas()["wal_autocheckpoint"] == 500
+    assert lq.pragmas()["temp_store"] == 2
+    lq.close()
+
+    monkeypatch.setenv("LITEQUERY_PROFILE", "fastest")
+    with pytest.raises(ValueError):
+        litequery.setup(db_path, QUERIES_PATH)
+
+
+@pytest.mark.parametrize("pool_size", [None, 2])
+def test_set_pragmas_reaches_other_connections(db_path, pool_size):
+    lq = litequery.setup(db_path, QUERIES_PATH, pool_size=pool_size)
+    other = threading.Thread(target=lq.get_all_users)
+    other.start()
+    other.join()
+
+    lq.set_pragmas(cache_size=-4096)
+    assert lq.pragmas()["cache_size"] == -4096
+
+    values = []
+    other = threading.Thread(target=lambda: values.append(lq.pragmas()))
+    other.start()
+    other.join()
+    assert values[0]["cache_size"] == -4096
+    lq.close()
+
+
+@pytest.mark.parametrize("pool_size", [None, 2])
+def test_pragmas_reports_writer_values(db_path, pool_size):
+    lq = litequery.setup(
+        db_path, QUERIES_PATH, pool_size=pool_size, profile="write_heavy"
+    )
+    pragmas = lq.pragmas()
+    assert pragmas["journal_size_limit"] == 268435456
+    assert pragmas["wal_autocheckpoint"] == 10000
+    assert pragmas["journal_mode"] == "wal"
+    lq.close()
+
+
+def test_set_pragmas_rejects_bad_values(lq):
+    with pytest.raises(ValueError):
+        lq.set_pragmas(cache_size="1; drop table users")
+
+
+def test_bulk_load(lq):
+    with lq.bulk_load():
+        assert lq.raw_value("pragma synchronous") == 0
+        assert lq.raw_value("pragma journal_mode") == "wal"
+        lq.insert_user(name="Dave", email="dave@example.com")
+    assert lq.raw_value("pragma synchronous") == 1
+    assert len(lq.get_all_users()) == 4
+
+    with lq.bulk_load(journal_mode="off"):
+        assert lq.raw_value("pragma journal_mode") == "off"
+    assert lq.raw_value("pragma journal_mode") == "wal"
+
+
+@pytest.mark.parametrize(
+    "options", [{"pool_size": 2}, {"maintenance": True, "maintenance_interval": 0.01}]
+)
+def test_bulk_load_with_other_connections(db_path, options):
+    lq = litequery.setup(db_path, QUERIES_PATH, **options)
+    assert len(lq.get_all_users()) == 3
+    with lq.bulk_load():
+        lq.insert_user.many(
+            {"name": f"user {i}", "email": f"{i}@example.com"} for i in range(100)
+        )
+        assert lq.raw_value("pragma synchronous") == 0
+    assert lq.raw_value("pragma journal_mode") == "wal"
+    assert len(lq.get_all_users()) == 103
+    lq.close()
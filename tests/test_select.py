@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import NamedTuple
 
 import pytest
 
@@ -56,3 +57,175 @@ def test_select_into(lq):
 def test_select_value(lq):
     user_id = lq.get_last_user_id()
     assert user_id == 3
+
+
+def test_select_rows_share_shape(lq):
+    users = lq.get_all_users()
+    assert users[0]._shape is users[1]._shape
+    assert users[2].to_dict()["name"] == "Charlie"
+
+
+def test_select_duplicate_columns(lq):
+    with pytest.raises(ValueError, match="Duplicate columns"):
+        lq.raw("select id, id from users")
+
+
+def test_select_iter(lq):
+    rows = lq.get_all_users.iter(batch_size=2)
+    assert next(rows).name == "Alice"
+    assert [user.name for user in rows] == ["Bob", "Charlie"]
+
+
+def test_select_iter_raw(lq):
+    rows = lq.raw_iter("select * from users where id in (:ids)", ids=[2, 3])
+    assert [user.id for user in rows] == [2, 3]
+
+
+def test_select_iter_requires_rows(lq):
+    with pytest.raises(TypeError):
+        lq.delete_all_users.iter()
+
+
+def test_select_in_reuses_statements(lq):
+    sql = "select * from users where id in (:ids)"
+    three, _ = lq._expand_parameters(sql, {"ids": [1, 2, 3]})
+    four, _ = lq._expand_parameters(sql, {"ids": [1, 2, 3, 4]})
+    assert three == four
+    assert len(lq.raw(sql, ids=[1, 2, 3])) == 3
+
+
+def test_select_in_similar_names(lq):
+    users = lq.raw(
+        "select * from users where id in (:ids) and id != :ids_extra",
+        ids=[1, 2, 3],
+        ids_extra=2,
+    )
+    assert [user.id for user in users] == [1, 3]
+
+
+def test_select_in_large_list(lq):
+    ids = list(range(10_000))
+    users = lq.raw("select * from users where id in (:ids)", ids=ids)
+    assert len(users) == 3
+
+    names = ["Bob"] + [f"user{i}" for i in range(40_000)]
+    users = lq.raw("select * from users where name in (:names)", names=names)
+    assert [user.name for user in users] == ["Bob"]
+
+
+def test_select_list_outside_in(lq):
+    row = lq.raw_one("select json_array(:values) as arr", values=[1, 2, 3])
+    assert row.arr == "[1,2,3]"
+
+
+@dataclass(slots=True)
+class SlimUser:
+    id: int
+    name: str
+
+
+class UserTuple(NamedTuple):
+    id: int
+    email: str
+    name: str = ""
+
+
+def test_select_into_slots_dataclass(lq):
+    users = lq.get_all_users().into(SlimUser)
+    assert users[2] == SlimUser(id=3, name="Charlie")
+
+
+def test_select_into_named_tuple(lq):
+    user = lq.get_user_by_id(id=2).into(UserTuple)
+    assert user == UserTuple(id=2, email="bob@example.com", name="Bob")
+
+
+def test_select_into_attrs_class(lq):
+    attrs = pytest.importorskip("attrs")
+
+    @attrs.define
+    class AttrsUser:
+        id: int
+        _email: str
+
+    user = lq.get_user_by_id(id=1).into(AttrsUser)
+    assert user._email == "alice@example.com"
+
+
+def test_query_method_into_skips_rows(lq):
+    users = lq.get_all_users.into(SlimUser)
+    assert [type(user) for user in users] == [SlimUser] * 3
+
+    user = lq.get_user_by_id.into(User, id=2)
+    assert isinstance(user, User)
+    assert user.name == "Bob"
+    assert lq.get_user_by_id.into(User, id=42) is None
+
+
+def test_select_columnar(lq):
+    columns = lq.get_all_users.columnar(batch_size=2)
+    assert list(columns) == ["id", "name", "email", "created_at"]
+    assert columns["id"].typecode == "q"
+    assert list(columns["id"]) == [1, 2, 3]
+    assert columns["name"] == ["Alice", "Bob", "Charlie"]
+    assert isinstance(columns["created_at"][0], datetime)
+
+
+def test_select_columnar_mixed_types(lq):
+    sql = "select 1 as n, 0.5 as x union all select 2, 2 union all select null, 3"
+    columns = lq.raw_columnar(sql, batch_size=2)
+    assert columns["x"].typecode == "d"
+    assert list(columns["x"]) == [0.5, 2.0, 3.0]
+    assert columns["n"] == [1, 2, None]
+
+
+def test_select_columnar_to_numpy(lq):
+    np = pytest.importorskip("numpy")
+    arrays = lq.get_all_users.columnar().to_numpy()
+    assert arrays["id"].dtype == np.int64
+    assert arrays["name"].tolist() == ["Alice", "Bob", "Charlie"]
+
+
+def test_paginate(lq):
+    pages = lq.get_all_users.paginate(order_by="id", page_size=2)
+    assert [[user.id for user in page] for page in pages] == [[1, 2], [3]]
+
+    pages = lq.get_all_users.paginate(order_by="name desc", page_size=2)
+    assert [user.name for page in pages for user in page] == [
+        "Charlie",
+        "Bob",
+        "Alice",
+    ]
+
+
+def test_paginate_composite_keys(lq):
+    lq.insert_user.many(
+        [{"name": f"user{i % 3}", "email": f"{i}@x"} for i in range(20)]
+    )
+    expected = sorted(lq.get_all_users(), key=lambda user: user.id, reverse=True)
+    expected = sorted(expected, key=lambda user: user.name)
+
+    for order_by in ("name, id desc", ["name asc", "id desc"]):
+        pages = list(lq.get_all_users.paginate(order_by=order_by, page_size=4))
+        assert all(len(page) == 4 for page in pages[:-1])
+        assert [user.id for page in pages for user in page] == [
+            user.id for user in expected
+        ]
+
+
+def test_paginate_rejects_bad_keys(lq):
+    with pytest.raises(ValueError):
+        next(lq.get_all_users.paginate(order_by="id; drop table users"))
+    with pytest.raises(TypeError):
+        lq.get_user_by_id.paginate(order_by="id", id=1)
+
+
+def test_select_in_same_result_at_any_length(lq):
+    lq.raw("update users set name = '1' where id = 1")
+    sql = "select id from users where name in (:names)"
+    short = lq.raw(sql, names=[1, 2, 3, 4, 5])
+    long = lq.raw(sql, names=list(range(1, 301)))
+    assert [u.id for u in short] == [u.id for u in long] == [1]
+
+    sql = "select id from users where id in (:ids)"
+    assert len(lq.raw(sql, ids=["1", "2"])) == len(lq.raw(sql, ids=["1", "2"] * 200))
@@ -0,0 +1,214 @@
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+import litequery
+from litequery.aio import AsyncLitequery
+
+QUERIES = """
+-- name: get_audit_entries
+-- database: audit
+select * from entries order by id;
+
+-- name: insert_audit_entry<!
+-- database: audit
+insert into entries (message) values (:message);
+
+-- name: get_tenant_notes
+-- shard: tenants tenant_id
+select * from notes where tenant_id = :tenant_id order by id;
+
+-- name: get_note^
+-- shard: tenants tenant_id
+select * from notes where id = :id;
+
+-- name: insert_note<!
+-- shard: tenants tenant_id
+insert into notes (tenant_id, body) values (:tenant_id, :body);
+
+-- name: insert_metric!
+-- shard: metrics day
+insert into metrics (day, value) values (:day, :value);
+
+-- name: get_metrics
+-- shard: metrics day
+select * from metrics order by day;
+
+"""
+
+SCHEMAS = {
+    "entries": "create table entries (id integer primary key, message text)",
+    "notes": "create table notes (id integer primary key, tenant_id, body text)",
+    "metrics": "create table metrics (day text, value integer)",
+}
+
+
+@pytest.fixture
+def queries_path(tmp_path):
+    path = tmp_path / "queries"
+    path.mkdir()
+    (path / "queries.sql").write_text(QUERIES)
+    return path
+
+
+@pytest.fixture
+def routed(db_path, queries_path):
+    lq = litequery.setup(
+        db_path,
+        queries_path,
+        databases={"audit": "audit.db"},
+        shards={
+            "tenants": ["tenants-0.db", "tenants-1.db", "tenants-2.db"],
+            "metrics": "metrics/{:%Y-%m}.db",
+        },
+    )
+    lq.databases["audit"].raw(SCHEMAS["entries"])
+    for shard in lq.shards["tenants"].all():
+        shard.raw(SCHEMAS["notes"])
+    yield lq
+    lq.close()
+
+
+def test_database_routing(routed, db_path):
+    routed.insert_audit_entry(message="hello")
+    assert [e.message for e in routed.get_audit_entries()] == ["hello"]
+    assert (db_path.parent / "audit.db").exists()
+    assert len(routed.raw("select * from users")) == 3
+
+
+def test_shard_key_routes_writes(routed):
+    tenants = routed.shards["tenants"]
+    for tenant_id in range(10):
+        routed.insert_note(tenant_id=tenant_id, body=f"note {tenant_id}")
+
+    for tenant_id in range(10):
+        shard = tenants.for_key(tenant_id)
+        rows = shard.raw("select * from notes where tenant_id = :t", t=tenant_id)
+        assert len(rows) == 1
+        assert [n.body for n in routed.get_tenant_notes(tenant_id=tenant_id)] == [
+            f"note {tenant_id}"
+        ]
+    assert sum(len(s.raw("select * from notes")) for s in tenants.all()) == 10
+
+
+def test_fan_out_reads(routed):
+    routed.insert_note(tenant_id=1, body="first")
+    routed.insert_note(tenant_id=2, body="second")
+
+    assert routed.get_note(id=1).id == 1
+    assert routed.get_note(id=99) is None
+    assert len(list(routed.get_tenant_notes.iter(tenant_id=1))) == 1
+
+    with pytest.raises(ValueError, match="shard key"):
+        routed.insert_note(body="orphan")
+    with pytest.raises(ValueError, match="shard key"):
+        routed.get_tenant_notes.paginate("id")
+
+
+def test_many_across_shards(routed):
+    rows = [{"tenant_id": i, "body": str(i)} for i in range(20)]
+    ids = routed.insert_note.many(rows)
+    assert len(ids) == 20
+    for row, note_id in zip(rows, ids):
+        shard = routed.shards["tenants"].for_key(row["tenant_id"])
+        body = shard.raw_value("select body from notes where id = :id", id=note_id)
+        assert body == row["body"]
+
+
+def test_routed_writes_refused_in_transaction(routed):
+    with routed.transaction():
+        assert routed.get_audit_entries() == []
+        with pytest.raises(RuntimeError, match="another database"):
+            routed.insert_audit_entry(message="lost")
+        with pytest.raises(RuntimeError, match="another database"):
+            routed.insert_note(tenant_id=1, body="lost")
+        with pytest.raises(RuntimeError, match="another database"):
+            routed.insert_note.many([{"tenant_id": 1, "body": "lost"}])
+    assert routed.get_audit_entries() == []
+
+    audit = routed.databases["audit"]
+    with audit.transaction():
+        routed.insert_audit_entry(message="kept")
+    assert [e.message for e in routed.get_audit_entries()] == ["kept"]
+
+
+def test_gather_runs_routed_reads_on_calling_thread(routed, monkeypatch):
+    threads = []
+    audit = routed.databases["audit"]
+    audit.close()
+    create_connection = audit._create_connection
+
+    def record(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return create_connection(*args, **kwargs)
+
+    monkeypatch.setattr(audit, "_create_connection", record)
+    routed.insert_audit_entry(message="hello")
+    audit.close()
+    entries, notes = routed.gather(
+        routed.q.get_audit_entries(), routed.q.get_tenant_notes(tenant_id=1)
+    )
+    assert [e.message for e in entries] == ["hello"] and notes == []
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_time_shards(routed, db_path):
+    metrics = routed.shards["metrics"]
+    assert metrics.all() == []
+    for day in ("2024-01-15", "2024-02-01"):
+        metrics.for_key(day).raw(SCHEMAS["metrics"])
+
+    routed.insert_metric(day="2024-01-15", value=1)
+    routed.insert_metric(day=datetime(2024, 2, 3), value=2)
+    assert (db_path.parent / "metrics" / "2024-01.db").exists()
+    assert [m.value for m in routed.get_metrics()] == [1, 2]
+
+    with pytest.raises(TypeError):
+        metrics.for_key(20240101)
+
+
+def test_async_routing(routed):
+    async def main():
+        async with AsyncLitequery(routed) as alq:
+            await alq.insert_note(tenant_id=7, body="async")
+            return await alq.get_tenant_notes(tenant_id=7)
+
+    assert [n.body for n in asyncio.run(main())] == ["async"]
+
+
+def test_attach(db_path, tmp_path):
+    queries_path = tmp_path / "attached"
+    queries_path.mkdir()
+    (queries_path / "queries.sql").write_text(
+        "-- name: get_archived_users\nselect * from archive.users order by id;\n"
+    )
+    archive = tmp_path / "archive.db"
+    with sqlite3.connect(archive) as conn:
+        conn.execute("create table users (id integer primary key, name text)")
+        conn.execute("insert into users values (1, 'Dora')")
+    conn.close()
+
+    lq = litequery.setup(db_path, queries_path, attach={"archive": "archive.db"})
+    assert [u.name for u in lq.get_archived_users()] == ["Dora"]
+    lq.close()
+
+    lq = litequery.setup(
+        db_path, queries_path, attach={"archive": "archive.db"}, pool_size=2
+    )
+    assert [u.name for u in lq.get_archived_users()] == ["Dora"]
+    lq.close()
+
+
+def test_invalid_routing(db_path, tmp_path):
+    path = tmp_path / "bad"
+    path.mkdir()
+    (path / "queries.sql").write_text(
+        "-- name: delete_notes!\n-- shard: tenants tenant_id\ndelete from notes;\n"
+    )
+    with pytest.raises(ValueError, match="unknown shard group"):
+        litequery.setup(db_path, path)
+    with pytest.raises(ValueError, match="isn't a parameter"):
+        litequery.setup(db_path, path, shards={"tenants": ["a.db"]})
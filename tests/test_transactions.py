@@ -1,5 +1,11 @@
+import sqlite3
+import threading
+
 import pytest
 
+import litequery
+from tests.conftest import QUERIES_PATH
+
 
 def test_transaction_rollback(lq):
     with pytest.raises(Exception):
@@ -10,3 +16,73 @@ def test_transaction_rollback(lq):
 
     users = lq.get_all_users()
     assert len(users) == 3
+
+
+def test_transaction_commit(lq):
+    with lq.transaction():
+        lq.insert_user(name="Dave", email="dave@example.com")
+    assert len(lq.get_all_users()) == 4
+
+
+def test_nested_transaction_rolls_back_to_savepoint(lq):
+    with lq.transaction():
+        lq.insert_user(name="Dave", email="dave@example.com")
+        with pytest.raises(ValueError):
+            with lq.transaction():
+                lq.insert_user(name="Eve", email="eve@example.com")
+                raise ValueError
+        with lq.transaction():
+            lq.insert_user(name="Frank", email="frank@example.com")
+
+    names = [user.name for user in lq.get_all_users()]
+    assert names[3:] == ["Dave", "Frank"]
+
+
+def test_nested_transaction_rolled_back_with_outer(lq):
+    with pytest.raises(ValueError):
+        with lq.transaction():
+            with lq.transaction():
+                lq.insert_user(name="Dave", email="dave@example.com")
+            raise ValueError
+    assert len(lq.get_all_users()) == 3
+
+
+@pytest.mark.parametrize("mode", ["deferred", "immediate", "exclusive"])
+def test_transaction_modes(lq, mode):
+    with lq.transaction(mode=mode):
+        lq.insert_user(name="Dave", email="dave@example.com")
+    assert len(lq.get_all_users()) == 4
+
+
+def test_transaction_unknown_mode(lq):
+    with pytest.raises(ValueError):
+        with lq.transaction(mode="sometimes"):
+            pass
+
+
+def test_transaction_retries_busy(lq, db_path, monkeypatch):
+    monkeypatch.setattr(lq, "BUSY_BACKOFF", 0.01)
+    lq.connect()
+    lq._get_connection().execute("PRAGMA busy_timeout = 0")
+    blocker = sqlite3.connect(db_path, autocommit=True, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.02, blocker.execute, ["ROLLBACK"]).start()
+
+    with lq.transaction():
+        lq.insert_user(name="Dave", email="dave@example.com")
+    assert len(lq.get_all_users()) == 4
+    blocker.close()
+
+
+@pytest.mark.parametrize("pool_size", [None, 2])
+def test_read_snapshot_ignores_concurrent_writes(db_path, pool_size):
+    lq = litequery.setup(db_path, QUERIES_PATH, pool_size=pool_size)
+    writer = sqlite3.connect(db_path, autocommit=True)
+    with lq.read_snapshot():
+        assert len(lq.get_all_users()) == 3
+        writer.execute("insert into users (name, email) values ('Dave', 'd@x')")
+        assert len(lq.get_all_users()) == 3
+        assert lq.get_last_user_id() == 3
+    assert len(lq.get_all_users()) == 4
+    writer.close()
+    lq.close()
@@ -0,0 +1,83 @@
+import io
+import json
+import sqlite3
+import sys
+
+import pytest
+
+from litequery import cli
+from litequery.transfer import export_rows, import_records, read_records
+
+
+@pytest.fixture
+def run_cli(db_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_PATH", str(db_path))
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["lq", *args])
+        cli.main()
+
+    return run
+
+
+def test_export_rows_formats(db_path):
+    conn = sqlite3.connect(db_path)
+    out = io.StringIO()
+    assert export_rows(conn.execute("select id, name from users"), out) == 3
+    assert out.getvalue().splitlines() == ["id,name", "1,Alice", "2,Bob", "3,Charlie"]
+
+    out = io.StringIO()
+    export_rows(conn.execute("select id, x'ff' as raw from users"), out, "ndjson")
+    assert json.loads(out.getvalue().splitlines()[0]) == {"id": 1, "raw": "ff"}
+    conn.close()
+
+
+def test_import_records_in_batches(db_path):
+    conn = sqlite3.connect(db_path, autocommit=True)
+    records = ({"name": f"user{i}", "email": f"{i}@x"} for i in range(25))
+    assert import_records(conn, "users", records, batch_size=10) == 25
+    assert conn.execute("select count(*) from users").fetchone()[0] == 28
+
+    csv_file = io.StringIO("user_id,name\n1,signed_up\n")
+    assert import_records(conn, "events", read_records(csv_file)) == 1
+    conn.close()
+
+
+def test_cli_export_import_round_trip(run_cli, db_path, tmp_path, capsys):
+    exported = tmp_path / "users.ndjson"
+    run_cli("export", "users", "-o", str(exported))
+    assert "Exported 3 rows" in capsys.readouterr().err
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("delete from users")
+    run_cli("import", "users", str(exported), "--no-sync")
+    assert "Imported 3 rows" in capsys.readouterr().err
+
+    with sqlite3.connect(db_path) as conn:
+        names = [name for (name,) in conn.execute("select name from users")]
+    assert names == ["Alice", "Bob", "Charlie"]
+
+
+def test_cli_export_named_query(run_cli, tmp_path, capsys):
+    (tmp_path / "queries").mkdir()
+    (tmp_path / "queries" / "users.sql").write_text(
+        "-- name: users_after\nselect name from users where id > :id;\n"
+    )
+    run_cli("export", "users_after", "-p", "id=1", "--format", "csv")
+    assert capsys.readouterr().out.splitlines() == ["name", "Bob", "Charlie"]
+
+
+def test_cli_export_expands_list_params(run_cli, tmp_path, capsys):
+    (tmp_path / "queries").mkdir()
+    (tmp_path / "queries" / "users.sql").write_text(
+        "-- name: users_by_ids\nselect name from users where id in (:ids);\n"
+    )
+    run_cli("export", "users_by_ids", "-p", "ids=[1, 3]", "--format", "csv")
+    assert capsys.readouterr().out.splitlines() == ["name", "Alice", "Charlie"]
+
+
+def test_cli_export_table_rejects_params(run_cli, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run_cli("export", "users", "-p", "id=1")
+    assert "'users' is a table, -p needs a named query" in str(exit_info.value)
+    assert capsys.readouterr().out == ""